@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import platform
+import statistics
+import tempfile
+import timeit
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import LAST_YEAR, SCALES, SyntheticScale, state_names, synthetic_series, write_synthetic_data
+from data_pipeline import IncrementalBuilder, build_data_bundle, compact_unified, ensure_years_with_forecast
+from metrics import (
+    BenchmarkMatrix,
+    MetricStore,
+    apply_scenario,
+    compute_benchmark,
+    compute_benchmark_matrix,
+    compute_main_kpis,
+    render_sparkline_svgs,
+)
+
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+BASELINE_FORMAT = 1
+
+# A benchmark regresses when its best time exceeds the baseline's * threshold.
+# The minimum over repeats is compared, being the least sensitive to noise.
+DEFAULT_THRESHOLDS = {
+    "default": 1.5,
+    # Reads and parses every CSV from disk.
+    "build_data_bundle": 2.0,
+    # Sub-millisecond calls, where scheduler noise alone reaches 1.5x.
+    "compute_main_kpis": 2.5,
+    "compute_benchmark": 2.5,
+    "benchmark_matrix": 2.5,
+}
+
+FORECAST_MAX_YEAR = LAST_YEAR + 2
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    run: Callable[[], Any]
+    rows: int
+
+
+def _benchmarks(data_dir: Path, scale: SyntheticScale) -> list[Benchmark]:
+    min_year = scale.first_year
+    local = IncrementalBuilder(data_dir).build_local()
+    series = synthetic_series(scale)
+    forecast_input = pd.concat([local, series], ignore_index=True)
+    store = MetricStore(
+        compact_unified(ensure_years_with_forecast(forecast_input, min_year=min_year, max_year=FORECAST_MAX_YEAR))
+    )
+    states = [name.replace("Sao Paulo", "São Paulo") for _, name in state_names(scale)]
+    state_a, state_b = states[-2:]
+    # One sparkline per (synthetic metric, state), as in a per-state table.
+    sparkline_matrix, _ = store.matrix(
+        series[["metric", "segment"]].drop_duplicates().itertuples(index=False, name=None),
+        range(min_year, LAST_YEAR + 1),
+    )
+
+    return [
+        Benchmark(
+            "build_data_bundle",
+            # A fresh builder per call, so every run is a cold build.
+            lambda: build_data_bundle(
+                min_year=min_year,
+                max_year=FORECAST_MAX_YEAR,
+                builder=IncrementalBuilder(data_dir),
+                offline=True,
+            ),
+            rows=len(local),
+        ),
+        Benchmark(
+            "ensure_years_with_forecast",
+            lambda: ensure_years_with_forecast(forecast_input, min_year=min_year, max_year=FORECAST_MAX_YEAR),
+            rows=len(forecast_input),
+        ),
+        Benchmark("metric_store", lambda: MetricStore(store.df), rows=len(store.df)),
+        Benchmark("apply_scenario", lambda: apply_scenario(store, 12.0, -1.5, 4.0), rows=len(store.df)),
+        # The store has no version, so compute_kpis bypasses its memo.
+        Benchmark("compute_main_kpis", lambda: compute_main_kpis(store, LAST_YEAR), rows=len(store.df)),
+        Benchmark(
+            "compute_benchmark",
+            lambda: compute_benchmark(store, state_a, state_b, LAST_YEAR + 1),
+            rows=len(store.df),
+        ),
+        Benchmark(
+            "benchmark_matrix",
+            # No store version, so nothing is memoized: gather plus every pairwise matrix.
+            lambda: _all_pairs(compute_benchmark_matrix(store, states)),
+            rows=len(states) ** 2,
+        ),
+        # The uncached renderer: every call draws every series.
+        Benchmark("sparklines", lambda: render_sparkline_svgs(sparkline_matrix), rows=len(sparkline_matrix)),
+    ]
+
+
+def _all_pairs(matrix: BenchmarkMatrix) -> list[np.ndarray]:
+    year = LAST_YEAR + 1
+    return [
+        *(matrix.ratio(metric, year) for metric in matrix.metrics),
+        *(matrix.difference(metric, year) for metric in matrix.metrics),
+        matrix.growth_ratio(matrix.metrics[0], LAST_YEAR, LAST_YEAR + 2),
+    ]
+
+
+def _time(run: Callable[[], Any], repeat: int) -> dict[str, Any]:
+    timer = timeit.Timer(run)
+    number, _ = timer.autorange()
+    per_call = [total / number for total in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "median_s": round(statistics.median(per_call), 9),
+        "min_s": round(min(per_call), 9),
+        "loops": number,
+        "repeat": repeat,
+    }
+
+
+def run_scale(name: str, scale: SyntheticScale, repeat: int = 5) -> dict[str, Any]:
+    """Times every benchmark on a freshly generated dataset of the given scale."""
+    with tempfile.TemporaryDirectory(prefix=f"cerveja-bench-{name}-") as tmp:
+        data_dir = write_synthetic_data(tmp, scale)
+        results = {}
+        for benchmark in _benchmarks(data_dir, scale):
+            results[benchmark.name] = {**_time(benchmark.run, repeat), "rows": benchmark.rows}
+    return {"scale": scale.to_dict(), "results": results}
+
+
+def run_suite(scale_names: list[str], repeat: int = 5) -> dict[str, Any]:
+    return {
+        "format": BASELINE_FORMAT,
+        "created_utc": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+        },
+        "scales": {name: run_scale(name, SCALES[name], repeat) for name in scale_names},
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    One row per benchmark present in both runs at the same scale, with the
+    ratio of best times, the threshold that applies and whether it regressed.
+    """
+    thresholds = {**DEFAULT_THRESHOLDS, **baseline.get("thresholds", {})}
+    rows = []
+    for scale_name, scale_run in current["scales"].items():
+        reference = baseline.get("scales", {}).get(scale_name)
+        if reference is None or reference["scale"] != scale_run["scale"]:
+            continue
+        for bench, result in scale_run["results"].items():
+            previous = reference["results"].get(bench)
+            if previous is None:
+                continue
+            threshold = thresholds.get(bench, thresholds["default"])
+            ratio = result["min_s"] / previous["min_s"]
+            rows.append(
+                {
+                    "scale": scale_name,
+                    "benchmark": bench,
+                    "baseline_s": previous["min_s"],
+                    "current_s": result["min_s"],
+                    "ratio": round(ratio, 3),
+                    "threshold": threshold,
+                    "regressed": ratio > threshold,
+                }
+            )
+    return rows
+
+
+def load_baseline(path: Path | str = BASELINE_PATH) -> dict[str, Any] | None:
+    path = Path(path)
+    if not path.exists():
+        return None
+    baseline = json.loads(path.read_text(encoding="utf-8"))
+    if baseline.get("format") != BASELINE_FORMAT:
+        return None
+    return baseline
+
+
+def write_baseline(current: dict[str, Any], path: Path | str = BASELINE_PATH) -> Path:
+    """Writes the run as the new baseline, keeping hand-tuned thresholds and other scales."""
+    path = Path(path)
+    previous = load_baseline(path) or {}
+    baseline = {
+        **current,
+        "thresholds": previous.get("thresholds", DEFAULT_THRESHOLDS),
+        "scales": {**previous.get("scales", {}), **current["scales"]},
+    }
+    path.write_text(json.dumps(baseline, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return path
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline and metrics on synthetic data.")
+    parser.add_argument("--scale", action="append", choices=sorted(SCALES), help="repeatable; default: small")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--output", help="also write this run's results as JSON to this path")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the new baseline")
+    args = parser.parse_args()
+
+    current = run_suite(args.scale or ["small"], repeat=args.repeat)
+    if args.output:
+        Path(args.output).write_text(json.dumps(current, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    for scale_name, scale_run in current["scales"].items():
+        for bench, result in scale_run["results"].items():
+            print(f"{scale_name:<7} {bench:<28} {result['median_s'] * 1000:>10.3f} ms  ({result['rows']} rows)")
+
+    if args.update_baseline:
+        print(f"baseline: {write_baseline(current, args.baseline)}")
+        sys.exit(0)
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print("no baseline to compare against (run with --update-baseline)")
+        sys.exit(0)
+    rows = compare(current, baseline)
+    for row in rows:
+        flag = "REGRESSION" if row["regressed"] else "ok"
+        print(f"{row['scale']:<7} {row['benchmark']:<28} x{row['ratio']:<6} (limit x{row['threshold']}) {flag}")
+    sys.exit(1 if any(row["regressed"] for row in rows) else 0)
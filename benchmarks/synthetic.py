@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from pathlib import Path
+import shutil
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from data_pipeline import BASE_FILES, DATA_DIR, UNIFIED_COLUMNS
+
+
+# Last observed year; the scenario simulator and forecast target the years after it.
+LAST_YEAR = 2024
+
+UF_STATES = (
+    ("AC", "Acre"), ("AL", "Alagoas"), ("AP", "Amapá"), ("AM", "Amazonas"),
+    ("BA", "Bahia"), ("CE", "Ceará"), ("DF", "Distrito Federal"),
+    ("ES", "Espírito Santo"), ("GO", "Goiás"), ("MA", "Maranhão"),
+    ("MT", "Mato Grosso"), ("MS", "Mato Grosso do Sul"), ("MG", "Minas Gerais"),
+    ("PA", "Pará"), ("PB", "Paraíba"), ("PR", "Paraná"), ("PE", "Pernambuco"),
+    ("PI", "Piauí"), ("RJ", "Rio de Janeiro"), ("RN", "Rio Grande do Norte"),
+    ("RS", "Rio Grande do Sul"), ("RO", "Rondônia"), ("RR", "Roraima"),
+    ("SC", "Santa Catarina"), ("SP", "Sao Paulo"), ("SE", "Sergipe"),
+    ("TO", "Tocantins"),
+)
+
+# Tables without a state or year axis are copied from data/ unchanged.
+_FIXED_FRAMES = ("trade", "concentration", "styles", "exports_detailed")
+
+
+@dataclass(frozen=True)
+class SyntheticScale:
+    """
+    Size of a synthetic dataset. states beyond the 27 UFs get generated
+    names; years count back from LAST_YEAR; metrics is the number of extra
+    per-state series from synthetic_series, which feed the forecast, metric
+    store and sparkline workloads but not build_data_bundle (it only parses
+    the BASE_FILES tables, which have no place for them); monthly writes
+    twelve IPCA rows per year (months 1..12, each the trailing 12-month
+    rate) like data/inflation_ipca.csv, instead of one December row.
+    """
+
+    states: int = 27
+    years: int = 10
+    metrics: int = 10
+    monthly: bool = False
+    seed: int = 0
+
+    @property
+    def first_year(self) -> int:
+        return LAST_YEAR - self.years + 1
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+SCALES: dict[str, SyntheticScale] = {
+    "small": SyntheticScale(states=27, years=10, metrics=10, monthly=False),
+    "medium": SyntheticScale(states=100, years=30, metrics=50, monthly=True),
+    "large": SyntheticScale(states=500, years=60, metrics=200, monthly=True),
+}
+
+
+def state_names(scale: SyntheticScale) -> list[tuple[str, str]]:
+    """(code, name) pairs: the UFs first, then generated states."""
+    states = list(UF_STATES[: scale.states])
+    states += [(f"E{index:03d}", f"Estado {index:03d}") for index in range(len(states) + 1, scale.states + 1)]
+    return states
+
+
+def _growth_series(rng: np.random.Generator, start: float, periods: int, drift: float) -> np.ndarray:
+    steps = 1 + rng.normal(drift, 0.03, size=periods)
+    steps[0] = 1.0
+    return start * np.cumprod(steps)
+
+
+def synthetic_frames(scale: SyntheticScale) -> dict[str, pd.DataFrame]:
+    """Every BASE_FILES table except the fixed ones, at the given scale."""
+    rng = np.random.default_rng(scale.seed)
+    years = np.arange(scale.first_year, LAST_YEAR + 1)
+    status = np.where(years < LAST_YEAR, "official", "estimated")
+    codes, names = zip(*state_names(scale))
+
+    zero = _growth_series(rng, 0.05, len(years), 0.12)
+    total = _growth_series(rng, 14.0, len(years), 0.01)
+    breweries = _growth_series(rng, 300.0, len(years), 0.10).round()
+    volume = pd.DataFrame(
+        {
+            "Year": years,
+            "Zero_Beer_Billion_Liters": zero.round(4),
+            "Total_Beer_Billion_Liters": total.round(3),
+            "Regular_Beer_Billion_Liters": (total - zero).round(4),
+            "data_status": status,
+            "source": "Sintético",
+        }
+    )
+    breweries_history = pd.DataFrame(
+        {
+            "year": years,
+            "breweries_count": breweries.astype(int),
+            "growth_pct_vs_prev": np.r_[np.nan, np.diff(breweries) / breweries[:-1] * 100].round(1),
+            "source": [f"Sintético {year}" for year in years],
+            "data_status": status,
+        }
+    )
+
+    # One row per (year, state), as in the MAPA state table.
+    state_grid = pd.MultiIndex.from_product([years, names], names=["year", "state"]).to_frame(index=False)
+    state_grid["breweries_count"] = rng.integers(5, 500, size=len(state_grid))
+    state_grid["source"] = "MAPA " + state_grid["year"].astype(str)
+
+    population = rng.integers(500_000, 45_000_000, size=scale.states)
+    state_breweries = rng.integers(5, 500, size=scale.states)
+    density = pd.DataFrame(
+        {
+            "state": codes,
+            "breweries_count": state_breweries,
+            "population": population,
+            "breweries_per_100k": (state_breweries / population * 100_000).round(2),
+            "inhabitants_per_brewery": (population // state_breweries),
+        }
+    )
+    spending = pd.DataFrame(
+        {"state": names, "spending_billion_reais": rng.uniform(0.2, 12.0, size=scale.states).round(1)}
+    )
+
+    region = pd.DataFrame(
+        {
+            "year": years,
+            "sudeste_breweries": (breweries * 0.46).round().astype(int),
+            "sudeste_share_pct": rng.uniform(44, 48, size=len(years)).round(1),
+            "norte_breweries": (breweries * 0.02).round().astype(int),
+            "norte_growth_pct": rng.uniform(5, 25, size=len(years)).round(1),
+            "source": [f"MAPA {year}" for year in years],
+        }
+    )
+    per_capita = pd.DataFrame(
+        {"year": years, "liters_per_capita": rng.uniform(55, 70, size=len(years)).round(1), "source": "Sintético"}
+    )
+
+    if scale.monthly:
+        # Trailing 12-month rate for each month, compounded from monthly rates
+        # that start eleven months before the first January.
+        monthly_rates = rng.uniform(0.15, 0.65, size=(2, len(years) * 12 + 11)) / 100
+        windows = np.lib.stride_tricks.sliding_window_view(1 + monthly_rates, 12, axis=1)
+        ipca_beer, ipca_general = (np.prod(windows, axis=2) - 1) * 100
+        inflation_years, months = np.repeat(years, 12), np.tile(np.arange(1, 13), len(years))
+    else:
+        ipca_beer, ipca_general = rng.uniform(2, 8, size=(2, len(years)))
+        # The December row carries the 12-month rate.
+        inflation_years, months = years, 12
+    inflation = pd.DataFrame(
+        {
+            "year": inflation_years,
+            "month": months,
+            "ipca_beer_pct": ipca_beer.round(2),
+            "ipca_general_pct": ipca_general.round(2),
+        }
+    )
+
+    return {
+        "volume": volume,
+        "spending": spending,
+        "breweries": breweries_history,
+        "state_breweries": state_grid,
+        "region_highlights": region,
+        "per_capita": per_capita,
+        "density": density,
+        "inflation": inflation,
+    }
+
+
+def write_synthetic_data(directory: Path | str, scale: SyntheticScale) -> Path:
+    """
+    Writes a complete data/ directory (every BASE_FILES CSV) for the scale,
+    usable as IncrementalBuilder(directory).
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for frame, df in synthetic_frames(scale).items():
+        df.to_csv(directory / BASE_FILES[frame], index=False)
+    for frame in _FIXED_FRAMES:
+        shutil.copyfile(DATA_DIR / BASE_FILES[frame], directory / BASE_FILES[frame])
+    return directory
+
+
+def synthetic_series(scale: SyntheticScale) -> pd.DataFrame:
+    """
+    scale.metrics extra observed series per state in the (uncompacted)
+    unified schema, to size the forecast and metric-store workloads.
+    """
+    rng = np.random.default_rng(scale.seed + 1)
+    years = np.arange(scale.first_year, LAST_YEAR + 1)
+    names = [name for _, name in state_names(scale)]
+    grid = pd.MultiIndex.from_product(
+        [[f"synthetic_metric_{index:03d}" for index in range(scale.metrics)], names, years],
+        names=["metric", "segment", "year"],
+    ).to_frame(index=False)
+    grid["segment_type"] = "state"
+    grid["value"] = rng.uniform(1, 1000, size=len(grid))
+    grid["data_status"] = "official"
+    grid["source"] = "Sintético"
+    return grid[UNIFIED_COLUMNS]
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Callable
+
+import altair as alt
+import pandas as pd
+import streamlit as st
+
+from memo import BoundedLRU
+
+
+ChartBuilder = Callable[[pd.DataFrame], alt.TopLevelMixin]
+
+CHART_BUILDERS: dict[str, ChartBuilder] = {}
+
+
+def chart_builder(builder_id: str) -> Callable[[ChartBuilder], ChartBuilder]:
+    """
+    Registers a function that turns a data slice into an (unthemed, unsized)
+    Altair chart under a stable id, so its serialized spec can be cached.
+    """
+
+    def register(builder: ChartBuilder) -> ChartBuilder:
+        CHART_BUILDERS[builder_id] = builder
+        return builder
+
+    return register
+
+
+def _dark_theme(chart: alt.TopLevelMixin) -> alt.TopLevelMixin:
+    return chart.properties(
+        background="transparent"
+    ).configure_view(
+        stroke="rgba(148, 163, 184, 0.2)",
+        strokeWidth=1
+    ).configure_axis(
+        gridColor="rgba(148, 163, 184, 0.15)",
+        gridOpacity=0.3,
+        labelColor="#94a3b8",
+        labelFontSize=12,
+        titleColor="#e2e8f0",
+        titleFontSize=14,
+        titleFontWeight=700
+    ).configure_legend(
+        labelColor="#cbd5e1",
+        titleColor="#e2e8f0",
+        orient="top",
+        labelFontSize=11
+    )
+
+
+def _light_theme(chart: alt.TopLevelMixin) -> alt.TopLevelMixin:
+    return (
+        chart.properties(background="#ffffff")
+        .configure_view(stroke="#dbeafe", strokeWidth=1.2)
+        .configure_axis(
+            gridColor="#e2e8f0",
+            tickColor="#94a3b8",
+            labelColor="#334155",
+            titleColor="#0f172a",
+        )
+        .configure_legend(labelColor="#334155", titleColor="#0f172a")
+    )
+
+
+THEMES: dict[str, Callable[[alt.TopLevelMixin], alt.TopLevelMixin]] = {
+    "dark": _dark_theme,
+    "light": _light_theme,
+}
+
+
+def apply_theme(chart: alt.TopLevelMixin, theme: str, height: int | None = None) -> alt.TopLevelMixin:
+    chart = THEMES[theme](chart)
+    if height is not None:
+        chart = chart.properties(height=height)
+    return chart
+
+
+def frame_digest(df: pd.DataFrame) -> str:
+    """
+    Content hash of a slice: column names, dtypes and row values in order.
+    The index is ignored, as it is by Altair.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr([(str(name), str(dtype)) for name, dtype in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _spec_nbytes(spec: dict[str, Any]) -> int:
+    return len(json.dumps(spec, default=str))
+
+
+# Specs are a few KB each; 64 MB covers every chart of many bundle versions.
+_SPEC_CACHE = BoundedLRU(max_entries=512, max_bytes=64 * 1024 * 1024, sizeof=_spec_nbytes)
+
+
+def chart_spec(
+    builder_id: str,
+    data: pd.DataFrame,
+    theme: str = "dark",
+    height: int | None = None,
+) -> dict[str, Any]:
+    """
+    Serialized Vega-Lite spec for a registered builder, rebuilt only when the
+    (builder, data digest, theme, height) key has not been seen before.
+    Shared across reruns and sessions; treat the result as read-only.
+    """
+    key = (builder_id, frame_digest(data), theme, height)
+    return _SPEC_CACHE.get_or_compute(
+        key, lambda: apply_theme(CHART_BUILDERS[builder_id](data), theme, height).to_dict()
+    )
+
+
+def render_chart(
+    builder_id: str,
+    data: pd.DataFrame,
+    height: int | None = None,
+    theme: str = "dark",
+    **kwargs: Any,
+) -> Any:
+    spec = chart_spec(builder_id, data, theme, height)
+    return st.vega_lite_chart(spec, use_container_width=True, **kwargs)
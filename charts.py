@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import altair as alt
+import numpy as np
+import pandas as pd
+
+from chart_cache import chart_builder
+from data_pipeline import METRIC_REGULAR_VOL, METRIC_ZERO_VOL
+
+
+# Builders for the Home charts. Each takes the slice it plots and returns the
+# bare chart; theme and height are applied (and the spec cached) by chart_cache.
+
+_LEGEND_STYLE = {"titleColor": "#e2e8f0", "labelColor": "#cbd5e1"}
+
+# Point selection on the state ranking bars; st.vega_lite_chart reports it
+# under this name when rendered with on_select.
+STATE_SELECTION = "state_pick"
+
+
+@chart_builder("market_share_donut")
+def market_share_donut(market_data: pd.DataFrame) -> alt.TopLevelMixin:
+    market_chart = alt.Chart(market_data).mark_arc(
+        innerRadius=80,
+        outerRadius=130,
+        stroke='#1e293b',
+        strokeWidth=3
+    ).encode(
+        theta=alt.Theta('Share:Q'),
+        color=alt.Color(
+            'Fabricante:N',
+            scale=alt.Scale(
+                domain=['Ambev', 'Heineken Brasil', 'Grupo Petrópolis', 'Outros'],
+                range=['#f59e0b', '#10b981', '#06b6d4', '#64748b']
+            ),
+            legend=alt.Legend(title="Fabricante", **_LEGEND_STYLE)
+        ),
+        tooltip=[
+            alt.Tooltip('Fabricante:N', title='Fabricante'),
+            alt.Tooltip('Share:Q', format='.1f', title='Market Share (%)'),
+            alt.Tooltip('Marcas:N', title='Principais Marcas')
+        ]
+    )
+
+    labels = market_chart.mark_text(radius=150, fontSize=14, fontWeight='bold', color='#e2e8f0').encode(
+        text=alt.Text('Share:Q', format='.1f')
+    )
+    return market_chart + labels
+
+
+@chart_builder("growth_bars")
+def growth_bars(growth_data: pd.DataFrame) -> alt.TopLevelMixin:
+    growth_chart = alt.Chart(growth_data).mark_bar(
+        cornerRadiusTopRight=10,
+        opacity=0.9
+    ).encode(
+        x=alt.X('Crescimento:Q', title='Crescimento (%)', scale=alt.Scale(domain=[0, 22])),
+        y=alt.Y('Categoria:N', sort='-x', title=''),
+        color=alt.Color('Cor:N', scale=None, legend=None),
+        tooltip=[
+            alt.Tooltip('Categoria:N', title='Categoria'),
+            alt.Tooltip('Crescimento:Q', format='.1f', title='Crescimento (%)')
+        ]
+    )
+
+    text = growth_chart.mark_text(align='left', dx=5, fontSize=13, color='#e2e8f0', fontWeight='bold').encode(
+        text=alt.Text('Crescimento:Q', format='.0f')
+    )
+    return growth_chart + text
+
+
+@chart_builder("top_brands_bars")
+def top_brands_bars(brands_data: pd.DataFrame) -> alt.TopLevelMixin:
+    brands_chart = alt.Chart(brands_data).mark_bar(
+        cornerRadiusTopRight=10,
+        opacity=0.9
+    ).encode(
+        x=alt.X('Consumo:Q', title='% Consumidores'),
+        y=alt.Y('Marca:N', sort='-x', title=''),
+        color=alt.Color(
+            'Fabricante:N',
+            scale=alt.Scale(
+                domain=['Ambev', 'Heineken'],
+                range=['#f59e0b', '#10b981']
+            ),
+            legend=alt.Legend(title="Fabricante", **_LEGEND_STYLE)
+        ),
+        tooltip=[
+            alt.Tooltip('Marca:N', title='Marca'),
+            alt.Tooltip('Consumo:Q', format='.1f', title='% Consumidores'),
+            alt.Tooltip('Fabricante:N', title='Fabricante')
+        ]
+    )
+
+    text_brands = brands_chart.mark_text(align='left', dx=5, fontSize=12, color='#e2e8f0', fontWeight='bold').encode(
+        text=alt.Text('Consumo:Q', format='.1f')
+    )
+    return brands_chart + text_brands
+
+
+@chart_builder("zero_volume_line")
+def zero_volume_line(volume_df: pd.DataFrame) -> alt.TopLevelMixin:
+    base = alt.Chart(volume_df)
+
+    # Linha principal com gradiente neon
+    line = base.mark_line(
+        point=alt.OverlayMarkDef(size=150, filled=True, color="#10b981"),
+        strokeWidth=5,
+        color="#10b981"
+    ).encode(
+        x=alt.X("year:Q", axis=alt.Axis(format="d", title="Ano")),
+        y=alt.Y("value:Q", title="Volume (bilhões de litros)"),
+        tooltip=[
+            alt.Tooltip("year:Q", title="Ano", format="d"),
+            alt.Tooltip("value:Q", title="Volume", format=".3f"),
+        ]
+    )
+
+    # Área de projeção
+    proj_df = volume_df[volume_df["year"] >= 2024]
+    area = alt.Chart(proj_df).mark_area(opacity=0.25, color="#10b981").encode(
+        x="year:Q", y="value:Q"
+    )
+
+    # Rótulos com valores
+    labels = base.mark_text(
+        fontSize=13,
+        fontWeight='bold',
+        dy=-15,
+        color='#10b981'
+    ).encode(
+        x=alt.X('year:Q'),
+        y=alt.Y('value:Q'),
+        text=alt.Text('value:Q', format='.2f')
+    )
+    return line + area + labels
+
+
+@chart_builder("zero_share_area")
+def zero_share_area(share_df: pd.DataFrame) -> alt.TopLevelMixin:
+    share_chart = alt.Chart(share_df).mark_area(
+        line={'color': '#f59e0b', 'strokeWidth': 4},
+        color=alt.Gradient(
+            gradient='linear',
+            stops=[
+                alt.GradientStop(color='rgba(251, 191, 36, 0.3)', offset=0),
+                alt.GradientStop(color='rgba(245, 158, 11, 0.6)', offset=1)
+            ],
+            x1=0, x2=0, y1=1, y2=0
+        )
+    ).encode(
+        x=alt.X("year:Q", axis=alt.Axis(format="d", title="Ano")),
+        y=alt.Y("value:Q", title="Share (%)", scale=alt.Scale(domain=[0, 6])),
+        tooltip=[alt.Tooltip("year:Q", format="d"), alt.Tooltip("value:Q", format=".1f", title="Share %")]
+    )
+
+    # Rótulos com valores percentuais
+    share_labels = alt.Chart(share_df).mark_text(
+        fontSize=12,
+        fontWeight='bold',
+        dy=-12,
+        color='#f59e0b'
+    ).encode(
+        x=alt.X("year:Q"),
+        y=alt.Y("value:Q"),
+        text=alt.Text("value:Q", format=".1f")
+    )
+    return share_chart + share_labels
+
+
+@chart_builder("zero_vs_regular_lines")
+def zero_vs_regular_lines(volumes: pd.DataFrame) -> alt.TopLevelMixin:
+    comp_df = volumes.assign(categoria=volumes["metric"].map({
+        METRIC_ZERO_VOL: "Cerveja Zero",
+        METRIC_REGULAR_VOL: "Cerveja Tradicional"
+    }))
+
+    comp_chart = alt.Chart(comp_df).mark_line(
+        point=alt.OverlayMarkDef(size=120, filled=True),
+        strokeWidth=4
+    ).encode(
+        x=alt.X("year:Q", axis=alt.Axis(format="d", title="Ano")),
+        y=alt.Y("value:Q", title="Volume (bi L)"),
+        color=alt.Color(
+            "categoria:N",
+            scale=alt.Scale(
+                domain=["Cerveja Zero", "Cerveja Tradicional"],
+                range=["#10b981", "#64748b"]
+            ),
+            legend=alt.Legend(title="Categoria", **_LEGEND_STYLE)
+        ),
+        tooltip=[
+            alt.Tooltip("year:Q", format="d", title="Ano"),
+            alt.Tooltip("categoria:N", title="Tipo"),
+            alt.Tooltip("value:Q", format=".2f", title="Volume")
+        ]
+    )
+
+    # Rótulos com valores diferenciados por cor
+    comp_labels = alt.Chart(comp_df).mark_text(
+        fontSize=11,
+        fontWeight='bold',
+        dy=-12
+    ).encode(
+        x=alt.X("year:Q"),
+        y=alt.Y("value:Q"),
+        text=alt.Text("value:Q", format=".2f"),
+        color=alt.Color(
+            "categoria:N",
+            scale=alt.Scale(
+                domain=["Cerveja Zero", "Cerveja Tradicional"],
+                range=["#10b981", "#94a3b8"]
+            ),
+            legend=None
+        )
+    )
+    return comp_chart + comp_labels
+
+
+def _state_ranking_bars(
+    df: pd.DataFrame,
+    color: str,
+    axis_title: str,
+    tooltip_title: str,
+    value_format: str,
+    label_format: str,
+    selectable: bool = False,
+) -> alt.TopLevelMixin:
+    bars = alt.Chart(df).mark_bar(
+        color=color,
+        cornerRadiusTopRight=10,
+        opacity=0.9
+    ).encode(
+        x=alt.X("value:Q", title=axis_title),
+        y=alt.Y("segment:N", sort="-x", title=""),
+        tooltip=[
+            alt.Tooltip("segment:N", title="Estado"),
+            alt.Tooltip("value:Q", format=value_format, title=tooltip_title)
+        ]
+    )
+
+    text = bars.mark_text(align='left', dx=5, fontSize=11, color='#e2e8f0', fontWeight='bold').encode(
+        text=alt.Text("value:Q", format=label_format)
+    )
+    if selectable:
+        # Added after deriving the labels, so the parameter lives on one layer only.
+        pick = alt.selection_point(name=STATE_SELECTION, fields=["segment"])
+        bars = bars.add_params(pick).encode(opacity=alt.condition(pick, alt.value(0.9), alt.value(0.35)))
+    return bars + text
+
+
+@chart_builder("state_breweries_bars")
+def state_breweries_bars(brew_state: pd.DataFrame) -> alt.TopLevelMixin:
+    return _state_ranking_bars(
+        brew_state, "#10b981", "Cervejarias", "Cervejarias", ",.0f", ",.0f", selectable=True
+    )
+
+
+@chart_builder("state_spending_bars")
+def state_spending_bars(spending_df: pd.DataFrame) -> alt.TopLevelMixin:
+    return _state_ranking_bars(spending_df, "#f59e0b", "R$ bilhões", "R$ bi", ".2f", ".1f")
+
+
+def _concentration_donut(df: pd.DataFrame, color: str, tooltip_title: str) -> alt.TopLevelMixin:
+    donut = alt.Chart(df).mark_arc(innerRadius=70, outerRadius=110, stroke="#1e293b", strokeWidth=2).encode(
+        theta="value:Q",
+        color=alt.Color(
+            "segment:N",
+            scale=alt.Scale(
+                domain=["Top 1%", "Microbreweries"],
+                range=[color, "#334155"]
+            ),
+            legend=alt.Legend(title="Segmento", **_LEGEND_STYLE)
+        ),
+        tooltip=[
+            alt.Tooltip("segment:N", title="Segmento"),
+            alt.Tooltip("value:Q", format=".1f", title=tooltip_title)
+        ]
+    )
+
+    labels = donut.mark_text(radius=140, fontSize=16, fontWeight='bold', color='#e2e8f0').encode(
+        text=alt.Text("value:Q", format=".0f")
+    )
+    return donut + labels
+
+
+@chart_builder("concentration_volume_donut")
+def concentration_volume_donut(conc_vol: pd.DataFrame) -> alt.TopLevelMixin:
+    return _concentration_donut(conc_vol, "#10b981", "% do Volume")
+
+
+@chart_builder("concentration_breweries_donut")
+def concentration_breweries_donut(conc_brew: pd.DataFrame) -> alt.TopLevelMixin:
+    return _concentration_donut(conc_brew, "#f59e0b", "% Cervejarias")
+
+
+@chart_builder("state_ratio_heatmap")
+def state_ratio_heatmap(pairs: pd.DataFrame) -> alt.TopLevelMixin:
+    # One cell per (state_a, state_b) from BenchmarkMatrix.pairs; ratio = A / B.
+    # The log scale has no place for 0 or inf, so those cells are left blank.
+    ratio = pairs["ratio"]
+    pairs = pairs.assign(ratio=ratio.where((ratio > 0) & np.isfinite(ratio)))
+    return alt.Chart(pairs).mark_rect(stroke="#0f172a", strokeWidth=1).encode(
+        x=alt.X("state_b:N", title="Estado B", axis=alt.Axis(labelAngle=-45)),
+        y=alt.Y("state_a:N", title="Estado A"),
+        color=alt.Color(
+            "ratio:Q",
+            scale=alt.Scale(type="log", scheme="tealblues"),
+            legend=alt.Legend(title="A / B", **_LEGEND_STYLE)
+        ),
+        tooltip=[
+            alt.Tooltip("state_a:N", title="Estado A"),
+            alt.Tooltip("state_b:N", title="Estado B"),
+            alt.Tooltip("ratio:Q", format=".2f", title="A / B")
+        ]
+    )
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from memo import BoundedLRU
+
+
+# Copy-on-Write is always on from pandas 3; before that it is a process-wide
+# option this module leaves alone.
+_COPY_ON_WRITE = int(pd.__version__.split(".")[0]) >= 3
+
+
+def _read_only(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    The slice with buffers that refuse in-place writes, so a cached slice
+    cannot be changed under the sessions sharing it. Under Copy-on-Write
+    such writes already go to a private copy.
+    """
+    if _COPY_ON_WRITE:
+        return frame
+    columns = {}
+    for name, series in frame.items():
+        values = series.array
+        if isinstance(values, pd.Categorical):
+            codes = values.codes.copy()
+            codes.flags.writeable = False
+            columns[name] = pd.Categorical.from_codes(codes, dtype=values.dtype)
+        elif isinstance(series.dtype, np.dtype):
+            array = series.to_numpy(copy=True)
+            array.flags.writeable = False
+            columns[name] = array
+        else:
+            columns[name] = values
+    return pd.DataFrame(columns, index=frame.index, copy=False)
+
+
+class DashboardQueries:
+    """
+    Per-bundle query layer for the Home sections.
+
+    The unified table is partitioned by metric once; every slice handed out
+    is memoized on its filter parameters and its buffers shared (read-only,
+    see _read_only) across reruns and sessions. Callers get a shallow copy,
+    so adding or replacing a column never reaches the cached slice.
+    """
+
+    def __init__(self, unified_df: pd.DataFrame, version: str) -> None:
+        self.version = version
+        self._df = unified_df
+        self._by_metric: dict[str, pd.DataFrame] = {
+            str(metric): frame
+            for metric, frame in unified_df.groupby("metric", observed=True, sort=False)
+        }
+        # Slices share their parent's buffers, so entries are bounded by count only.
+        self._cache = BoundedLRU(max_entries=256)
+
+    @property
+    def unified(self) -> pd.DataFrame:
+        return self._df
+
+    def years(self) -> list[int]:
+        return sorted(int(year) for year in self._df["year"].unique())
+
+    def filtered(self, statuses: Iterable[str]) -> pd.DataFrame:
+        key = ("filtered", tuple(sorted(statuses)))
+        return self._cache.get_or_compute(
+            key, lambda: _read_only(self._df[self._df["data_status"].isin(key[1])])
+        ).copy(deep=False)
+
+    def select(
+        self,
+        metrics: str | Iterable[str],
+        statuses: Iterable[str],
+        segment: str | None = None,
+        segment_type: str | None = None,
+        year: int | None = None,
+        exclude_segments: Iterable[str] = (),
+        top_n: int | None = None,
+    ) -> pd.DataFrame:
+        """
+        Rows of the given metric(s) matching every filter that is set.
+        top_n keeps the n largest values (as DataFrame.nlargest).
+        """
+        metric_key = (metrics,) if isinstance(metrics, str) else tuple(metrics)
+        key = (
+            "select",
+            metric_key,
+            tuple(sorted(statuses)),
+            segment,
+            segment_type,
+            year,
+            tuple(exclude_segments),
+            top_n,
+        )
+        return self._cache.get_or_compute(key, lambda: _read_only(self._select(key))).copy(deep=False)
+
+    def _select(self, key: tuple) -> pd.DataFrame:
+        _, metric_key, statuses, segment, segment_type, year, exclude_segments, top_n = key
+        parts = [self._by_metric[metric] for metric in metric_key if metric in self._by_metric]
+        if not parts:
+            frame = self._df.iloc[0:0]
+        else:
+            frame = parts[0] if len(parts) == 1 else pd.concat(parts).sort_index()
+        mask = frame["data_status"].isin(statuses)
+        if segment is not None:
+            mask &= frame["segment"] == segment
+        if segment_type is not None:
+            mask &= frame["segment_type"] == segment_type
+        if year is not None:
+            mask &= frame["year"] == year
+        if exclude_segments:
+            mask &= ~frame["segment"].isin(exclude_segments)
+        frame = frame[mask]
+        if top_n is not None:
+            frame = frame.nlargest(top_n, "value")
+        return frame
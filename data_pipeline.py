@@ -1,13 +1,23 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
 from dataclasses import dataclass
 from datetime import datetime, timezone
+import hashlib
 from pathlib import Path
 import re
-from typing import Any
+import threading
+import time
+from typing import Any, Callable, Iterable
 
+import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+
+from html_extract import ExtractionRule, extract_value
+from http_cache import HTTP_CACHE_DIR, CachedResponse, HttpCache
+from pipeline_profile import PipelineProfile
 
 
 DATA_DIR = Path(__file__).parent / "data"
@@ -38,11 +48,29 @@ METRIC_BEER_STYLE_PCT = "beer_style_percentage"
 METRIC_INFLATION_IPCA = "inflation_ipca_beer_pct"
 METRIC_GLOBAL_RANK_ZERO = "global_rank_zero_consumption"
 
+# Fixed category order for the compact unified schema.
+METRIC_VOCABULARY: tuple[str, ...] = tuple(
+    value for name, value in globals().items() if name.startswith("METRIC_")
+)
+DATA_STATUS_VOCABULARY: tuple[str, ...] = ("official", "estimated")
+
 RUNTIME_SOURCES = {
     "mapa_2022": "https://www.gov.br/agricultura/pt-br/assuntos/noticias/numero-de-cervejarias-registradas-no-brasil-cresce-11-6-em-2022",
     "mapa_2023": "https://www.gov.br/agricultura/pt-br/assuntos/noticias/mercado-cervejeiro-cresce-6-8-em-2023-e-chega-a-1-847-estabelecimentos-no-brasil",
     "mapa_2024": "https://www.gov.br/agricultura/pt-br/assuntos/noticias/brasil-chega-a-1-949-cervejarias-registradas",
 }
+# The pages also quote per-state counts and the previous year's total, so the
+# national figure is the largest count among the first few on the page.
+RUNTIME_MAX_MATCHES = 8
+RUNTIME_EXTRACTION_RULES: dict[str, ExtractionRule] = {
+    "mapa_2022": ExtractionRule(year=2022, max_matches=RUNTIME_MAX_MATCHES),
+    "mapa_2023": ExtractionRule(year=2023, max_matches=RUNTIME_MAX_MATCHES),
+    "mapa_2024": ExtractionRule(year=2024, max_matches=RUNTIME_MAX_MATCHES),
+}
+_RUNTIME_CHUNK_CHARS = 16 * 1024
+
+_RUNTIME_SESSION: requests.Session | None = None
+_RUNTIME_SESSION_LOCK = threading.Lock()
 
 
 @dataclass(frozen=True)
@@ -51,350 +79,554 @@ class RuntimeMeta:
     last_refresh_utc: str
     source_count: int
     notes: str
+    # Most recent refresh attempt; differs from last_refresh_utc when it failed
+    # and the previous bundle is still being served.
+    refresh_duration_s: float | None = None
+    refresh_outcome: str = "succeeded"
+    last_attempt_utc: str | None = None
 
 
-def _status_from_year(year: int, official_until: int = 2024) -> str:
-    return "official" if year <= official_until else "estimated"
+# Sources with status_rule="by_year" are official up to this year, estimated after.
+OFFICIAL_UNTIL_YEAR = 2024
 
 
-def _to_numeric(value: Any) -> float:
-    if pd.isna(value):
-        return float("nan")
-    if isinstance(value, (int, float)):
-        return float(value)
-    text = str(value).strip()
-    if not text:
-        return float("nan")
-    text = text.replace(".", "").replace(",", ".")
-    try:
-        return float(text)
-    except ValueError:
-        return float("nan")
+def _status_from_years(years: np.ndarray, official_until: int = OFFICIAL_UNTIL_YEAR) -> np.ndarray:
+    return np.where(years <= official_until, "official", "estimated").astype(object)
 
 
-def load_base_data() -> dict[str, pd.DataFrame]:
-    return {
-        "volume": pd.read_csv(DATA_DIR / "zero_vs_regular_beer_volume.csv"),
-        "spending": pd.read_csv(DATA_DIR / "alcoholic_beverage_spending_2025.csv"),
-        "breweries": pd.read_csv(DATA_DIR / "mapa_breweries_history.csv"),
-        "state_breweries": pd.read_csv(DATA_DIR / "mapa_state_breweries_selected.csv"),
-        "region_highlights": pd.read_csv(DATA_DIR / "mapa_region_highlights.csv"),
-        "trade": pd.read_csv(DATA_DIR / "mapa_trade_2024.csv"),
-        "per_capita": pd.read_csv(DATA_DIR / "consumption_per_capita.csv"),
-        "density": pd.read_csv(DATA_DIR / "brewery_density_by_state.csv"),
-        "concentration": pd.read_csv(DATA_DIR / "market_concentration.csv"),
-        "styles": pd.read_csv(DATA_DIR / "beer_styles.csv"),
-        "inflation": pd.read_csv(DATA_DIR / "inflation_ipca.csv"),
-        "exports_detailed": pd.read_csv(DATA_DIR / "exports_detailed_2024.csv"),
-    }
+BASE_FILES = {
+    "volume": "zero_vs_regular_beer_volume.csv",
+    "spending": "alcoholic_beverage_spending_2025.csv",
+    "breweries": "mapa_breweries_history.csv",
+    "state_breweries": "mapa_state_breweries_selected.csv",
+    "region_highlights": "mapa_region_highlights.csv",
+    "trade": "mapa_trade_2024.csv",
+    "per_capita": "consumption_per_capita.csv",
+    "density": "brewery_density_by_state.csv",
+    "concentration": "market_concentration.csv",
+    "styles": "beer_styles.csv",
+    "inflation": "inflation_ipca.csv",
+    "exports_detailed": "exports_detailed_2024.csv",
+}
 
 
-def _build_unified_local(base: dict[str, pd.DataFrame]) -> pd.DataFrame:
-    rows: list[dict[str, Any]] = []
+UNIFIED_COLUMNS = ["year", "metric", "segment", "segment_type", "value", "data_status", "source"]
 
-    volume_df = base["volume"].copy()
-    total = volume_df["Total_Beer_Billion_Liters"].replace(0, float("nan"))
-    volume_df["Zero_Share"] = (
-        volume_df["Zero_Beer_Billion_Liters"] / total * 100
-    )
-    for _, row in volume_df.iterrows():
-        year = int(row["Year"])
-        status = _status_from_year(year)
-        source = "Projeto beer_analyses (serie de volume)"
-        rows.extend(
-            [
-                {
-                    "year": year,
-                    "metric": METRIC_ZERO_VOL,
-                    "segment": "Brasil",
-                    "segment_type": "country",
-                    "value": float(row["Zero_Beer_Billion_Liters"]),
-                    "data_status": status,
-                    "source": source,
-                },
-                {
-                    "year": year,
-                    "metric": METRIC_REGULAR_VOL,
-                    "segment": "Brasil",
-                    "segment_type": "country",
-                    "value": float(row["Regular_Beer_Billion_Liters"]),
-                    "data_status": status,
-                    "source": source,
-                },
-                {
-                    "year": year,
-                    "metric": METRIC_TOTAL_VOL,
-                    "segment": "Brasil",
-                    "segment_type": "country",
-                    "value": float(row["Total_Beer_Billion_Liters"]),
-                    "data_status": status,
-                    "source": source,
-                },
-                {
-                    "year": year,
-                    "metric": METRIC_ZERO_SHARE,
-                    "segment": "Brasil",
-                    "segment_type": "country",
-                    "value": float(row["Zero_Share"]),
-                    "data_status": status,
-                    "source": source,
-                },
-            ]
-        )
+TRADE_METRIC_MAP = {
+    "Exportacoes de cerveja (volume)": METRIC_TRADE_EXPORT_VOL,
+    "Faturamento de exportacoes": METRIC_TRADE_EXPORT_REVENUE,
+    "Importacao da Alemanha (volume)": METRIC_TRADE_IMPORT_GERMANY_VOL,
+    "Participacao da Alemanha na importacao": METRIC_TRADE_IMPORT_GERMANY_SHARE,
+    "Participacao da America do Sul no destino das exportacoes": METRIC_TRADE_EXPORT_SA_SHARE,
+    "Participacao do Paraguai no volume exportado": METRIC_TRADE_EXPORT_PARAGUAY_SHARE,
+}
+TRADE_SEGMENT_MAP = {
+    METRIC_TRADE_EXPORT_VOL: "Brasil",
+    METRIC_TRADE_EXPORT_REVENUE: "Brasil",
+    METRIC_TRADE_IMPORT_GERMANY_VOL: "Alemanha",
+    METRIC_TRADE_IMPORT_GERMANY_SHARE: "Alemanha",
+    METRIC_TRADE_EXPORT_SA_SHARE: "America do Sul",
+    METRIC_TRADE_EXPORT_PARAGUAY_SHARE: "Paraguai",
+}
 
-    for _, row in base["breweries"].iterrows():
-        year = int(row["year"])
-        rows.append(
-            {
-                "year": year,
-                "metric": METRIC_BREWERIES,
-                "segment": "Brasil",
-                "segment_type": "country",
-                "value": float(row["breweries_count"]),
-                "data_status": "official",
-                "source": str(row.get("source", "MAPA")),
-            }
-        )
 
-    for _, row in base["state_breweries"].iterrows():
-        year = int(row["year"])
-        state_name = str(row["state"]).replace("Sao Paulo", "São Paulo").strip()
-        rows.append(
-            {
-                "year": year,
-                "metric": METRIC_BREWERIES,
-                "segment": state_name,
-                "segment_type": "state",
-                "value": float(row["breweries_count"]),
-                "data_status": "official",
-                "source": str(row.get("source", "MAPA")),
-            }
-        )
+@dataclass(frozen=True)
+class UnifiedSourceSpec:
+    """
+    Declarative mapping from one base frame to rows of the unified table.
 
-    region_df = base["region_highlights"].copy()
-    for _, row in region_df.iterrows():
-        year = int(row["year"])
-        if not pd.isna(row.get("sudeste_breweries")):
-            rows.append(
-                {
-                    "year": year,
-                    "metric": METRIC_REGION_SUDESTE_BREWERIES,
-                    "segment": "Sudeste",
-                    "segment_type": "region",
-                    "value": float(row["sudeste_breweries"]),
-                    "data_status": "official",
-                    "source": str(row.get("source", "MAPA")),
-                }
-            )
-        if not pd.isna(row.get("norte_breweries")):
-            rows.append(
-                {
-                    "year": year,
-                    "metric": METRIC_REGION_NORTE_BREWERIES,
-                    "segment": "Norte",
-                    "segment_type": "region",
-                    "value": float(row["norte_breweries"]),
-                    "data_status": "official",
-                    "source": str(row.get("source", "MAPA")),
-                }
-            )
-        if not pd.isna(row.get("sudeste_share_pct")):
-            rows.append(
-                {
-                    "year": year,
-                    "metric": METRIC_REGION_SUDESTE_SHARE,
-                    "segment": "Sudeste",
-                    "segment_type": "region",
-                    "value": float(row["sudeste_share_pct"]),
-                    "data_status": "official",
-                    "source": str(row.get("source", "MAPA")),
-                }
-            )
+    Each row of the source frame yields one unified row per entry in
+    value_columns (row-major, in declaration order). Segment, year and
+    source are either constants or columns of the (prepared) frame.
 
-    spending_df = base["spending"].copy()
-    for _, row in spending_df.iterrows():
-        rows.append(
-            {
-                "year": 2025,
-                "metric": METRIC_SPENDING,
-                "segment": str(row["state"]),
-                "segment_type": "state",
-                "value": float(row["spending_billion_reais"]),
-                "data_status": "official",
-                "source": "Recorte regional do projeto (2025)",
-            }
-        )
+    dtypes lists the CSV columns the spec reads, parsed with those types;
+    every other column is skipped while parsing (None reads all of them with
+    type inference). prepare must work row by row, since it runs per chunk.
+    """
 
-    trade_metric_map = {
-        "Exportacoes de cerveja (volume)": METRIC_TRADE_EXPORT_VOL,
-        "Faturamento de exportacoes": METRIC_TRADE_EXPORT_REVENUE,
-        "Importacao da Alemanha (volume)": METRIC_TRADE_IMPORT_GERMANY_VOL,
-        "Participacao da Alemanha na importacao": METRIC_TRADE_IMPORT_GERMANY_SHARE,
-        "Participacao da America do Sul no destino das exportacoes": METRIC_TRADE_EXPORT_SA_SHARE,
-        "Participacao do Paraguai no volume exportado": METRIC_TRADE_EXPORT_PARAGUAY_SHARE,
-    }
-    trade_segment_map = {
-        METRIC_TRADE_EXPORT_VOL: "Brasil",
-        METRIC_TRADE_EXPORT_REVENUE: "Brasil",
-        METRIC_TRADE_IMPORT_GERMANY_VOL: "Alemanha",
-        METRIC_TRADE_IMPORT_GERMANY_SHARE: "Alemanha",
-        METRIC_TRADE_EXPORT_SA_SHARE: "America do Sul",
-        METRIC_TRADE_EXPORT_PARAGUAY_SHARE: "Paraguai",
-    }
-    for _, row in base["trade"].iterrows():
-        metric_name = trade_metric_map.get(str(row["metric"]))
-        if not metric_name:
-            continue
-        rows.append(
-            {
-                "year": 2024,
-                "metric": metric_name,
-                "segment": trade_segment_map[metric_name],
-                "segment_type": "flow",
-                "value": float(row["value"]),
-                "data_status": "official",
-                "source": str(row.get("source", "MAPA")),
-            }
-        )
+    frame: str
+    value_columns: dict[str, str]
+    segment_type: str
+    segment: str | None = None
+    segment_column: str | None = None
+    segment_by_metric: dict[str, str] | None = None
+    year: int | None = None
+    year_column: str | None = None
+    status_rule: str = "official"  # "official" or "by_year"
+    source: str | None = None
+    source_column: str | None = None
+    source_default: str = "MAPA"
+    metric_column: str | None = None
+    dropna: bool = False
+    prepare: Callable[[pd.DataFrame], pd.DataFrame] | None = None
+    dtypes: dict[str, str] | None = None
 
-    # Per capita consumption
-    for _, row in base["per_capita"].iterrows():
-        rows.append(
-            {
-                "year": int(row["year"]),
-                "metric": METRIC_PER_CAPITA,
-                "segment": "Brasil",
-                "segment_type": "country",
-                "value": float(row["liters_per_capita"]),
-                "data_status": _status_from_year(int(row["year"])),
-                "source": str(row["source"]),
-            }
-        )
 
-    # Brewery density by state
-    for _, row in base["density"].iterrows():
-        rows.append(
-            {
-                "year": 2024,
-                "metric": METRIC_DENSITY_STATE,
-                "segment": str(row["state"]),
-                "segment_type": "state",
-                "value": float(row["breweries_per_100k"]),
-                "data_status": "official",
-                "source": "MAPA Anuario 2025",
-            }
-        )
+def _prepare_volume(frame: pd.DataFrame) -> pd.DataFrame:
+    total = frame["Total_Beer_Billion_Liters"].replace(0, float("nan"))
+    return frame.assign(Zero_Share=frame["Zero_Beer_Billion_Liters"] / total * 100)
 
-    # Market concentration
-    for _, row in base["concentration"].iterrows():
-        rows.extend([
-            {
-                "year": 2024,
-                "metric": METRIC_CONCENTRATION_BREWERIES,
-                "segment": str(row["segment"]),
-                "segment_type": "market_segment",
-                "value": float(row["breweries_pct"]),
-                "data_status": "official",
-                "source": "MAPA Anuario 2025",
-            },
-            {
-                "year": 2024,
-                "metric": METRIC_CONCENTRATION_VOLUME,
-                "segment": str(row["segment"]),
-                "segment_type": "market_segment",
-                "value": float(row["volume_pct"]),
-                "data_status": "official",
-                "source": "MAPA Anuario 2025",
-            },
-        ])
-
-    # Beer styles
-    for _, row in base["styles"].iterrows():
-        rows.append(
-            {
-                "year": 2024,
-                "metric": METRIC_BEER_STYLE_PCT,
-                "segment": str(row["style"]),
-                "segment_type": "style",
-                "value": float(row["percentage"]),
-                "data_status": "official",
-                "source": "MAPA Anuario 2025",
-            }
-        )
 
-    # Inflation IPCA
-    for _, row in base["inflation"].iterrows():
-        rows.append(
-            {
-                "year": int(row["year"]),
-                "metric": METRIC_INFLATION_IPCA,
-                "segment": "Brasil",
-                "segment_type": "country",
-                "value": float(row["ipca_beer_pct"]),
-                "data_status": "official",
-                "source": "IBGE",
-            }
-        )
+def _prepare_state_breweries(frame: pd.DataFrame) -> pd.DataFrame:
+    state = frame["state"].map(str).str.replace("Sao Paulo", "São Paulo", regex=False).str.strip()
+    return frame.assign(state=state)
+
+
+def _prepare_trade(frame: pd.DataFrame) -> pd.DataFrame:
+    metric = frame["metric"].map(str).map(TRADE_METRIC_MAP)
+    return frame.assign(metric=metric)[metric.notna()]
+
+
+UNIFIED_SOURCE_SPECS: tuple[UnifiedSourceSpec, ...] = (
+    UnifiedSourceSpec(
+        frame="volume",
+        value_columns={
+            "Zero_Beer_Billion_Liters": METRIC_ZERO_VOL,
+            "Regular_Beer_Billion_Liters": METRIC_REGULAR_VOL,
+            "Total_Beer_Billion_Liters": METRIC_TOTAL_VOL,
+            "Zero_Share": METRIC_ZERO_SHARE,
+        },
+        segment="Brasil",
+        segment_type="country",
+        year_column="Year",
+        status_rule="by_year",
+        source="Projeto beer_analyses (serie de volume)",
+        prepare=_prepare_volume,
+        dtypes={
+            "Year": "int32",
+            "Zero_Beer_Billion_Liters": "float64",
+            "Regular_Beer_Billion_Liters": "float64",
+            "Total_Beer_Billion_Liters": "float64",
+        },
+    ),
+    UnifiedSourceSpec(
+        frame="breweries",
+        value_columns={"breweries_count": METRIC_BREWERIES},
+        segment="Brasil",
+        segment_type="country",
+        year_column="year",
+        source_column="source",
+        dtypes={"year": "int32", "breweries_count": "float64", "source": "str"},
+    ),
+    UnifiedSourceSpec(
+        frame="state_breweries",
+        value_columns={"breweries_count": METRIC_BREWERIES},
+        segment_column="state",
+        segment_type="state",
+        year_column="year",
+        source_column="source",
+        prepare=_prepare_state_breweries,
+        dtypes={"year": "int32", "state": "str", "breweries_count": "float64", "source": "str"},
+    ),
+    UnifiedSourceSpec(
+        frame="region_highlights",
+        value_columns={
+            "sudeste_breweries": METRIC_REGION_SUDESTE_BREWERIES,
+            "norte_breweries": METRIC_REGION_NORTE_BREWERIES,
+            "sudeste_share_pct": METRIC_REGION_SUDESTE_SHARE,
+        },
+        segment_by_metric={
+            METRIC_REGION_SUDESTE_BREWERIES: "Sudeste",
+            METRIC_REGION_NORTE_BREWERIES: "Norte",
+            METRIC_REGION_SUDESTE_SHARE: "Sudeste",
+        },
+        segment_type="region",
+        year_column="year",
+        source_column="source",
+        dropna=True,
+        dtypes={
+            "year": "int32",
+            "sudeste_breweries": "float64",
+            "norte_breweries": "float64",
+            "sudeste_share_pct": "float64",
+            "source": "str",
+        },
+    ),
+    UnifiedSourceSpec(
+        frame="spending",
+        value_columns={"spending_billion_reais": METRIC_SPENDING},
+        segment_column="state",
+        segment_type="state",
+        year=2025,
+        source="Recorte regional do projeto (2025)",
+        dtypes={"state": "str", "spending_billion_reais": "float64"},
+    ),
+    UnifiedSourceSpec(
+        frame="trade",
+        value_columns={"value": ""},
+        metric_column="metric",
+        segment_by_metric=TRADE_SEGMENT_MAP,
+        segment_type="flow",
+        year=2024,
+        source_column="source",
+        prepare=_prepare_trade,
+        dtypes={"metric": "str", "value": "float64", "source": "str"},
+    ),
+    UnifiedSourceSpec(
+        frame="per_capita",
+        value_columns={"liters_per_capita": METRIC_PER_CAPITA},
+        segment="Brasil",
+        segment_type="country",
+        year_column="year",
+        status_rule="by_year",
+        source_column="source",
+        dtypes={"year": "int32", "liters_per_capita": "float64", "source": "str"},
+    ),
+    UnifiedSourceSpec(
+        frame="density",
+        value_columns={"breweries_per_100k": METRIC_DENSITY_STATE},
+        segment_column="state",
+        segment_type="state",
+        year=2024,
+        source="MAPA Anuario 2025",
+        dtypes={"state": "str", "breweries_per_100k": "float64"},
+    ),
+    UnifiedSourceSpec(
+        frame="concentration",
+        value_columns={
+            "breweries_pct": METRIC_CONCENTRATION_BREWERIES,
+            "volume_pct": METRIC_CONCENTRATION_VOLUME,
+        },
+        segment_column="segment",
+        segment_type="market_segment",
+        year=2024,
+        source="MAPA Anuario 2025",
+        dtypes={"segment": "str", "breweries_pct": "float64", "volume_pct": "float64"},
+    ),
+    UnifiedSourceSpec(
+        frame="styles",
+        value_columns={"percentage": METRIC_BEER_STYLE_PCT},
+        segment_column="style",
+        segment_type="style",
+        year=2024,
+        source="MAPA Anuario 2025",
+        dtypes={"style": "str", "percentage": "float64"},
+    ),
+    UnifiedSourceSpec(
+        frame="inflation",
+        value_columns={"ipca_beer_pct": METRIC_INFLATION_IPCA},
+        segment="Brasil",
+        segment_type="country",
+        year_column="year",
+        source="IBGE",
+        dtypes={"year": "int32", "ipca_beer_pct": "float64"},
+    ),
+)
+
+# Fixed rows that do not come from any CSV.
+UNIFIED_CONSTANT_ROWS: tuple[dict[str, Any], ...] = (
+    {
+        "year": 2024,
+        "metric": METRIC_GLOBAL_RANK_ZERO,
+        "segment": "Brasil",
+        "segment_type": "country",
+        "value": 2.0,
+        "data_status": "official",
+        "source": "Ranking global consumo cerveja zero",
+    },
+)
+
+
+def _build_unified_block(frame: pd.DataFrame, spec: UnifiedSourceSpec) -> pd.DataFrame:
+    if spec.prepare is not None:
+        frame = spec.prepare(frame)
+
+    value_cols = list(spec.value_columns)
+    n_rows, n_cols = len(frame), len(value_cols)
+    # Row-major flattening keeps the per-row ordering of the old row loop.
+    values = frame[value_cols].to_numpy(dtype=float).ravel(order="C")
+    row_pos = np.repeat(np.arange(n_rows), n_cols)
 
-    # Global rank (fixed value)
-    rows.append(
+    if spec.metric_column is not None:
+        metrics = frame[spec.metric_column].to_numpy(dtype=object)[row_pos]
+    else:
+        metrics = np.tile(np.array(list(spec.value_columns.values()), dtype=object), n_rows)
+
+    if spec.year_column is not None:
+        years = frame[spec.year_column].astype(int).to_numpy()[row_pos]
+    else:
+        years = np.full(n_rows * n_cols, spec.year, dtype=int)
+
+    if spec.segment_by_metric is not None:
+        segments = pd.Series(metrics).map(spec.segment_by_metric).to_numpy(dtype=object)
+    elif spec.segment_column is not None:
+        segments = frame[spec.segment_column].map(str).to_numpy(dtype=object)[row_pos]
+    else:
+        segments = np.full(n_rows * n_cols, spec.segment, dtype=object)
+
+    if spec.status_rule == "by_year":
+        statuses = _status_from_years(years)
+    else:
+        statuses = np.full(n_rows * n_cols, spec.status_rule, dtype=object)
+
+    if spec.source_column is not None and spec.source_column in frame.columns:
+        sources = frame[spec.source_column].map(str).to_numpy(dtype=object)[row_pos]
+    else:
+        source = spec.source if spec.source is not None else spec.source_default
+        sources = np.full(n_rows * n_cols, source, dtype=object)
+
+    block = pd.DataFrame(
         {
-            "year": 2024,
-            "metric": METRIC_GLOBAL_RANK_ZERO,
-            "segment": "Brasil",
-            "segment_type": "country",
-            "value": 2.0,
-            "data_status": "official",
-            "source": "Ranking global consumo cerveja zero",
-        }
+            "year": years,
+            "metric": metrics,
+            "segment": segments,
+            "segment_type": spec.segment_type,
+            "value": values,
+            "data_status": statuses,
+            "source": sources,
+        },
+        columns=UNIFIED_COLUMNS,
     )
+    if spec.dropna:
+        block = block[~np.isnan(values)]
+    return block
 
-    unified = pd.DataFrame(rows)
+
+def _build_unified_local(blocks: list[pd.DataFrame]) -> pd.DataFrame:
+    # One block per UNIFIED_SOURCE_SPECS entry, in order; the constant rows go last.
+    blocks = [*blocks, pd.DataFrame(list(UNIFIED_CONSTANT_ROWS), columns=UNIFIED_COLUMNS)]
+    unified = pd.concat(blocks, ignore_index=True)
     unified["year"] = unified["year"].astype(int)
     unified["value"] = unified["value"].astype(float)
     return unified
 
 
-def fetch_runtime_updates(timeout_s: int = 8) -> dict[str, pd.DataFrame]:
-    updates: dict[str, pd.DataFrame] = {}
-    parsed_rows: list[dict[str, Any]] = []
+# Rows per parsed chunk when streaming a source CSV; bounds the raw rows held at once.
+CSV_CHUNK_ROWS = 200_000
+
+
+def _specs_by_frame() -> dict[str, list[tuple[int, UnifiedSourceSpec]]]:
+    by_frame: dict[str, list[tuple[int, UnifiedSourceSpec]]] = {}
+    for index, spec in enumerate(UNIFIED_SOURCE_SPECS):
+        by_frame.setdefault(spec.frame, []).append((index, spec))
+    return by_frame
 
-    for source_id, url in RUNTIME_SOURCES.items():
-        try:
-            response = requests.get(url, timeout=timeout_s)
-            response.raise_for_status()
-        except Exception:
-            continue
-        text = response.text
-        text = re.sub(r"<[^>]+>", " ", text)
-        text = re.sub(r"\s+", " ", text).lower()
-
-        year_match = re.search(r"(2022|2023|2024)", source_id)
-        if not year_match:
-            continue
-        year = int(year_match.group(1))
-        candidates = re.findall(
-            r"(\d{1,3}(?:[.,]\d{3})+|\d{3,4})\s+(?:cervejarias|estabelecimentos)",
-            text,
+
+def stream_unified_blocks(
+    path: Path | str,
+    specs: list[UnifiedSourceSpec],
+    chunksize: int = CSV_CHUNK_ROWS,
+) -> tuple[list[pd.DataFrame], int]:
+    """
+    Parses one source CSV in chunks, reading only the columns the specs use
+    with their declared dtypes, and turns each chunk into unified rows right
+    away, so the raw frame is never held whole.
+
+    Returns one block per spec (same rows as _build_unified_block on the full
+    frame) and the number of CSV rows read.
+    """
+    dtypes: dict[str, str] | None = {}
+    for spec in specs:
+        if spec.dtypes is None:
+            dtypes = None
+            break
+        dtypes.update(spec.dtypes)
+    read_options: dict[str, Any] = {}
+    if dtypes is not None:
+        # A callable tolerates optional columns (e.g. source) missing from a file.
+        read_options = {"usecols": lambda column: column in dtypes, "dtype": dtypes}
+
+    parts: list[list[pd.DataFrame]] = [[] for _ in specs]
+    rows_read = 0
+    with pd.read_csv(path, chunksize=chunksize, **read_options) as reader:
+        for chunk in reader:
+            rows_read += len(chunk)
+            for part, spec in zip(parts, specs):
+                part.append(_build_unified_block(chunk, spec))
+    if rows_read == 0:
+        header = pd.read_csv(path, nrows=0, **read_options)
+        return [_build_unified_block(header, spec) for spec in specs], 0
+    return [part[0] if len(part) == 1 else pd.concat(part, ignore_index=True) for part in parts], rows_read
+
+
+def _runtime_session() -> requests.Session:
+    """
+    Shared keep-alive session for runtime sources, sized so every source can
+    hold its own pooled connection while the fetches run concurrently.
+    """
+    global _RUNTIME_SESSION
+    with _RUNTIME_SESSION_LOCK:
+        if _RUNTIME_SESSION is None:
+            pool_size = max(4, len(RUNTIME_SOURCES))
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _RUNTIME_SESSION = session
+        return _RUNTIME_SESSION
+
+
+def _fetch_runtime_source(
+    session: requests.Session,
+    source_id: str,
+    url: str,
+    timeout_s: float,
+    cache: HttpCache | None,
+) -> tuple[dict[str, Any] | None, str]:
+    cached = cache.load(url) if cache is not None else None
+    # Streamed so parsing can stop (and the connection close) mid-page.
+    with session.get(url, timeout=timeout_s, headers=HttpCache.conditional_headers(cached), stream=True) as response:
+        if response.status_code == 304 and cached is not None:
+            # Unchanged upstream: reuse the values parsed last time.
+            return cached.parsed, "revalidated"
+        response.raise_for_status()
+        response.encoding = response.encoding or "utf-8"
+        chunks = response.iter_content(chunk_size=_RUNTIME_CHUNK_CHARS, decode_unicode=True)
+        parsed, text = _parse_runtime_page(source_id, url, chunks)
+    if cache is not None:
+        # body holds the markup read up to the match, not necessarily the whole page.
+        cache.store(
+            CachedResponse(
+                url=url,
+                body=text,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                fetched_utc=datetime.now(timezone.utc).isoformat(),
+                parsed=parsed,
+            )
         )
-        values = [_to_numeric(item) for item in candidates]
-        values = [v for v in values if not pd.isna(v)]
-        if not values:
-            continue
-        parsed_rows.append(
+    return parsed, "fresh"
+
+
+def _extraction_rule(source_id: str) -> ExtractionRule | None:
+    rule = RUNTIME_EXTRACTION_RULES.get(source_id)
+    if rule is None:
+        # Ad-hoc sources: the year comes from the id, the rule is the default one.
+        year_match = re.search(r"(20\d{2})", source_id)
+        if year_match:
+            rule = ExtractionRule(year=int(year_match.group(1)), max_matches=RUNTIME_MAX_MATCHES)
+    return rule
+
+
+def _parse_runtime_page(
+    source_id: str,
+    url: str,
+    chunks: Iterable[str],
+) -> tuple[dict[str, Any] | None, str]:
+    """
+    Scans the page markup chunk by chunk with the source's ExtractionRule.
+    Returns the parsed row (None when nothing matched) and the markup read.
+    """
+    rule = _extraction_rule(source_id)
+    if rule is None:
+        return None, ""
+    value, text = extract_value(chunks, rule)
+    if value is None:
+        return None, text
+    row = {
+        "year": rule.year,
+        "metric": METRIC_BREWERIES,
+        "segment": "Brasil",
+        "segment_type": "country",
+        "value": value,
+        "data_status": "official",
+        "source": url,
+    }
+    return row, text
+
+
+def _timed_fetch(
+    session: requests.Session,
+    source_id: str,
+    url: str,
+    timeout_s: float,
+    cache: HttpCache | None,
+) -> tuple[dict[str, Any] | None, str, float, int | None]:
+    # (parsed, outcome, latency_s, http_status); failures come back as "unavailable".
+    started = time.perf_counter()
+    try:
+        parsed, outcome = _fetch_runtime_source(session, source_id, url, timeout_s, cache)
+    except Exception as exc:
+        response = getattr(exc, "response", None)
+        return None, "unavailable", time.perf_counter() - started, getattr(response, "status_code", None)
+    return parsed, outcome, time.perf_counter() - started, 304 if outcome == "revalidated" else 200
+
+
+def _fetch_all_runtime_sources(
+    sources: dict[str, str],
+    timeout_s: float,
+    max_workers: int | None,
+    cache: HttpCache | None,
+) -> dict[str, tuple[dict[str, Any] | None, str, float, int | None]]:
+    deadline = time.monotonic() + timeout_s
+    session = _runtime_session()
+    results: dict[str, tuple[dict[str, Any] | None, str, float, int | None]] = {}
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers or len(sources),
+        thread_name_prefix="runtime-fetch",
+    )
+    try:
+        futures = {
+            executor.submit(_timed_fetch, session, source_id, url, timeout_s, cache): source_id
+            for source_id, url in sources.items()
+        }
+        for future in as_completed(futures, timeout=max(0.0, deadline - time.monotonic())):
+            try:
+                results[futures[future]] = future.result()
+            except Exception:
+                continue
+    except FuturesTimeoutError:
+        pass
+    finally:
+        # Do not wait for stragglers; their own socket timeout reaps them.
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
+def fetch_runtime_updates(
+    timeout_s: float = 8,
+    sources: dict[str, str] | None = None,
+    max_workers: int | None = None,
+    cache_dir: Path | str | None = HTTP_CACHE_DIR,
+    offline: bool = False,
+) -> dict[str, pd.DataFrame]:
+    """
+    Fetches every runtime source concurrently over a pooled session.
+
+    timeout_s is a global deadline for the whole batch, not a per-URL budget.
+    With a cache_dir, requests are conditional (ETag/Last-Modified) and a 304
+    reuses the values parsed last time. Sources that fail or miss the deadline
+    are served stale from the cache; stragglers keep running and refresh the
+    cache for the next call.
+
+    Returns "unified" (parsed rows, when any) and "sources" (one row per
+    source with its outcome: fresh, revalidated, stale or unavailable, plus
+    latency_s and http_status when the request finished in time).
+    offline=True skips the network and serves whatever the cache holds.
+    """
+    sources = RUNTIME_SOURCES if sources is None else sources
+    updates: dict[str, pd.DataFrame] = {}
+    if not sources:
+        return updates
+
+    cache = HttpCache(cache_dir) if cache_dir is not None else None
+    results: dict[str, tuple[dict[str, Any] | None, str, float, int | None]] = {}
+    if not offline:
+        results = _fetch_all_runtime_sources(sources, timeout_s, max_workers, cache)
+
+    parsed_rows: list[dict[str, Any]] = []
+    outcomes: list[dict[str, Any]] = []
+    for source_id, url in sources.items():
+        parsed, outcome, latency_s, http_status = results.get(source_id, (None, "unavailable", None, None))
+        if outcome == "unavailable" and cache is not None:
+            cached = cache.load(url)
+            if cached is not None and cached.parsed is not None:
+                parsed, outcome = cached.parsed, "stale"
+        outcomes.append(
             {
-                "year": year,
-                "metric": METRIC_BREWERIES,
-                "segment": "Brasil",
-                "segment_type": "country",
-                "value": float(max(values)),
-                "data_status": "official",
-                "source": url,
+                "source_id": source_id,
+                "url": url,
+                "outcome": outcome,
+                "latency_s": latency_s,
+                "http_status": http_status,
             }
         )
+        if parsed is not None:
+            parsed_rows.append(parsed)
 
     if parsed_rows:
         updates["unified"] = pd.DataFrame(parsed_rows)
+    updates["sources"] = pd.DataFrame(outcomes)
     return updates
 
 
@@ -411,30 +643,259 @@ def merge_with_priority(local_df: pd.DataFrame, online_df: pd.DataFrame) -> pd.D
 
 
 def _metric_fallback_growth(df: pd.DataFrame) -> dict[str, float]:
-    growth_map: dict[str, float] = {}
-    official_df = df[df["data_status"] == "official"].copy()
+    official_df = df[df["data_status"] == "official"].dropna(subset=["metric", "segment"])
     if official_df.empty:
-        return growth_map
+        return {}
 
-    for metric, metric_df in official_df.groupby("metric"):
-        growth_rates: list[float] = []
-        for _, segment_df in metric_df.groupby("segment"):
-            segment_df = segment_df.sort_values("year")
-            if len(segment_df) < 2:
-                continue
-            prev = segment_df.iloc[-2]
-            curr = segment_df.iloc[-1]
-            if prev["value"] == 0:
-                continue
-            growth_rates.append((curr["value"] - prev["value"]) / prev["value"])
-        growth_map[metric] = float(pd.Series(growth_rates).median()) if growth_rates else 0.0
-    return growth_map
+    ordered = official_df.sort_values(["metric", "segment", "year"], kind="stable")
+    grouped = ordered.groupby(["metric", "segment"], sort=False)
+    prev = grouped["value"].shift(1)
+    # Last observation of every (metric, segment) pair that has at least two rows.
+    is_last = ~ordered.duplicated(subset=["metric", "segment"], keep="last")
+    has_prev = grouped.cumcount() >= 1
+    selected = is_last & has_prev & (prev != 0)
+    last_rows = ordered.loc[selected, ["metric", "value"]]
+    last_prev = prev[selected]
+    rates = (last_rows["value"] - last_prev) / last_prev
+
+    medians = rates.groupby(last_rows["metric"]).median()
+    return {
+        str(metric): float(medians[metric]) if metric in medians.index else 0.0
+        for metric in ordered["metric"].unique()
+    }
+
+
+def _clamp_metric_array(values: np.ndarray, share_mask: np.ndarray) -> np.ndarray:
+    # Shares are clamped to [0, 100], everything else to >= 0. Written as
+    # max(0, min(100, v)) so NaN collapses to 100.0 for shares, 0.0 otherwise.
+    upper = np.where(values < 100.0, values, 100.0)
+    values = np.where(share_mask, upper, values)
+    return np.where(values > 0.0, values, 0.0)
+
+
+_FORECAST_WINDOW = 3
+_FORECAST_METHODS = np.array(["Estimated (CAGR)", "Estimated (linear)", "Estimated (fallback)"], dtype=object)
+
+
+def _push_history(
+    window_years: np.ndarray,
+    window_values: np.ndarray,
+    counts: np.ndarray,
+    groups: np.ndarray,
+    year: int,
+    values: np.ndarray,
+) -> None:
+    # groups must be unique; the newest observation lives in the last column.
+    window_years[groups, :-1] = window_years[groups, 1:]
+    window_values[groups, :-1] = window_values[groups, 1:]
+    window_years[groups, -1] = year
+    window_values[groups, -1] = values
+    counts[groups] += 1
+
+
+def _forecast_step(
+    window_years: np.ndarray,
+    window_values: np.ndarray,
+    counts: np.ndarray,
+    default_growth: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    One forecast year for many groups at once.
+    Returns (next values, method codes) with codes 0=CAGR, 1=linear, 2=fallback.
+    """
+    last = window_values[:, -1]
+    with np.errstate(all="ignore"):
+        nan_mask = np.isnan(window_values)
+        # Series.min() skips NaN; an all-NaN window never qualifies.
+        window_min = np.where(nan_mask, np.inf, window_values).min(axis=1)
+        use_cagr = (counts >= 3) & (window_min > 0) & ~nan_mask.all(axis=1)
+        span3 = window_years[:, -1] - window_years[:, 0]
+        safe_span3 = np.where(span3 > 0, span3, 1)
+        cagr_rate = np.where(
+            span3 > 0,
+            (window_values[:, -1] / window_values[:, 0]) ** (1 / safe_span3) - 1,
+            default_growth,
+        )
+
+        use_linear = ~use_cagr & (counts >= 2)
+        span2 = window_years[:, -1] - window_years[:, -2]
+        safe_span2 = np.where(span2 > 0, span2, 1)
+        annual_delta = np.where(span2 > 0, (window_values[:, -1] - window_values[:, -2]) / safe_span2, 0.0)
+
+        next_values = np.where(
+            use_cagr,
+            last * (1 + cagr_rate),
+            np.where(use_linear, last + annual_delta, last * (1 + default_growth)),
+        )
+    methods = np.where(use_cagr, 0, np.where(use_linear, 1, 2))
+    return next_values, methods
+
+
+def _forecast_missing_years(
+    df: pd.DataFrame,
+    fallback_growth: dict[str, float],
+    min_year: int,
+    max_year: int,
+) -> pd.DataFrame:
+    """
+    Batched forecaster: walks the horizon year by year, but every step is a
+    whole-array operation over all (metric, segment, segment_type) groups.
+    Each group only keeps a rolling window of its last three observations.
+    """
+    group_cols = ["metric", "segment", "segment_type"]
+    ordered = df.sort_values("year", kind="stable")
+    gid = ordered.groupby(group_cols, dropna=False, sort=True).ngroup().to_numpy()
+    _, first_pos = np.unique(gid, return_index=True)
+    keys = ordered[group_cols].iloc[first_pos].reset_index(drop=True)
+    n_groups = len(keys)
+    years = ordered["year"].to_numpy(dtype=np.int64)
+    values = ordered["value"].to_numpy(dtype=float)
+
+    metrics = keys["metric"].tolist()
+    default_growth = np.array([fallback_growth.get(metric, 0.0) for metric in metrics], dtype=float)
+    share_mask = np.array(["share" in metric for metric in metrics], dtype=bool)
+
+    # Seed the rolling windows with history that precedes the horizon.
+    window_years = np.zeros((n_groups, _FORECAST_WINDOW), dtype=np.int64)
+    window_values = np.full((n_groups, _FORECAST_WINDOW), np.nan)
+    n_pre = int(np.searchsorted(years, min_year, side="left"))
+    pre_gid = gid[:n_pre]
+    counts = np.bincount(pre_gid, minlength=n_groups).astype(np.int64)
+    rank_from_end = pd.Series(pre_gid).groupby(pre_gid).cumcount(ascending=False).to_numpy()
+    keep = rank_from_end < _FORECAST_WINDOW
+    slots = _FORECAST_WINDOW - 1 - rank_from_end[keep]
+    window_years[pre_gid[keep], slots] = years[:n_pre][keep]
+    window_values[pre_gid[keep], slots] = values[:n_pre][keep]
 
+    out_groups: list[np.ndarray] = []
+    out_years: list[np.ndarray] = []
+    out_values: list[np.ndarray] = []
+    out_methods: list[np.ndarray] = []
+    for year in range(min_year, max_year + 1):
+        lo = int(np.searchsorted(years, year, side="left"))
+        hi = int(np.searchsorted(years, year, side="right"))
+        observed = np.zeros(n_groups, dtype=bool)
+        observed[gid[lo:hi]] = True
 
-def _clamp_metric(metric: str, value: float) -> float:
-    if "share" in metric:
-        return max(0.0, min(100.0, value))
-    return max(0.0, value)
+        targets = np.flatnonzero((counts > 0) & ~observed)
+        if targets.size:
+            next_values, methods = _forecast_step(
+                window_years[targets],
+                window_values[targets],
+                counts[targets],
+                default_growth[targets],
+            )
+            next_values = _clamp_metric_array(next_values, share_mask[targets])
+            out_groups.append(targets)
+            out_years.append(np.full(targets.size, year, dtype=np.int64))
+            out_values.append(next_values)
+            out_methods.append(methods)
+            _push_history(window_years, window_values, counts, targets, year, next_values)
+
+        if hi > lo:
+            obs_gid = gid[lo:hi]
+            obs_values = values[lo:hi]
+            # Duplicate rows for the same group and year are pushed in order.
+            ranks = pd.Series(obs_gid).groupby(obs_gid).cumcount().to_numpy()
+            for rank in range(int(ranks.max()) + 1):
+                sel = ranks == rank
+                _push_history(window_years, window_values, counts, obs_gid[sel], year, obs_values[sel])
+
+    if not out_groups:
+        return pd.DataFrame(columns=UNIFIED_COLUMNS)
+
+    groups = np.concatenate(out_groups)
+    gen_years = np.concatenate(out_years)
+    order = np.lexsort((gen_years, groups))
+    groups = groups[order]
+    generated_keys = keys.iloc[groups].reset_index(drop=True)
+    return pd.DataFrame(
+        {
+            "year": gen_years[order],
+            "metric": generated_keys["metric"],
+            "segment": generated_keys["segment"],
+            "segment_type": generated_keys["segment_type"],
+            "value": np.concatenate(out_values)[order],
+            "data_status": "estimated",
+            "source": _FORECAST_METHODS[np.concatenate(out_methods)[order]],
+        },
+        columns=UNIFIED_COLUMNS,
+    )
+
+
+def _vocabulary_categorical(series: pd.Series, vocabulary: tuple[str, ...]) -> pd.Categorical:
+    extra = sorted(set(series.dropna().astype(str)) - set(vocabulary))
+    return pd.Categorical(series.astype(str), categories=list(vocabulary) + extra)
+
+
+def compact_unified(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compact schema for the unified table: categoricals for the repeated text
+    columns (metric/data_status over a fixed vocabulary), int16 years and
+    float32 values only when every value round-trips exactly.
+
+    The source column is categorical too: its categories are the interned
+    source table and its codes the per-row source id (see source_table).
+    """
+    compact = pd.DataFrame(
+        {
+            "year": df["year"].astype(np.int16),
+            "metric": _vocabulary_categorical(df["metric"], METRIC_VOCABULARY),
+            "segment": df["segment"].astype("category"),
+            "segment_type": df["segment_type"].astype("category"),
+            "value": df["value"].astype(float),
+            "data_status": _vocabulary_categorical(df["data_status"], DATA_STATUS_VOCABULARY),
+            "source": df["source"].astype("category"),
+        },
+        index=df.index,
+    )
+    values = compact["value"].to_numpy()
+    # Only an exact round-trip keeps reads identical to float64 (72.84 is not one).
+    with np.errstate(over="ignore"):
+        narrowed = values.astype(np.float32)
+    if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True):
+        compact["value"] = narrowed
+    return compact
+
+
+def source_table(df: pd.DataFrame) -> pd.DataFrame:
+    sources = df["source"]
+    if not isinstance(sources.dtype, pd.CategoricalDtype):
+        sources = sources.astype("category")
+    return pd.DataFrame(
+        {"source_id": range(len(sources.cat.categories)), "source": sources.cat.categories}
+    )
+
+
+def memory_report(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Deep memory usage per column (bytes), with a final "total" row.
+    """
+    usage = df.memory_usage(deep=True, index=True)
+    report = pd.DataFrame(
+        {
+            "column": usage.index.astype(str),
+            "dtype": [str(df[col].dtype) if col in df.columns else "index" for col in usage.index],
+            "bytes": usage.to_numpy(dtype=np.int64),
+        }
+    )
+    total = pd.DataFrame([{"column": "total", "dtype": "", "bytes": int(report["bytes"].sum())}])
+    return pd.concat([report, total], ignore_index=True)
+
+
+def bundle_version(unified: pd.DataFrame) -> str:
+    """
+    Content hash of the unified table; changes whenever any row changes.
+    """
+    row_hashes = pd.util.hash_pandas_object(unified, index=False).to_numpy()
+    return format(int(row_hashes.sum(dtype=np.uint64)) ^ len(unified), "016x")
+
+
+def _with_forecast_rows(df: pd.DataFrame, generated: pd.DataFrame) -> pd.DataFrame:
+    result = df.copy()
+    if not generated.empty:
+        result = pd.concat([result, generated], ignore_index=True)
+    return result.sort_values(["metric", "segment", "year"]).reset_index(drop=True)
 
 
 def ensure_years_with_forecast(
@@ -445,94 +906,203 @@ def ensure_years_with_forecast(
     if df.empty:
         return df
 
-    result = df.copy()
-    fallback_growth = _metric_fallback_growth(result)
-    generated_rows: list[dict[str, Any]] = []
+    fallback_growth = _metric_fallback_growth(df)
+    generated = _forecast_missing_years(df, fallback_growth, min_year, max_year)
+    return _with_forecast_rows(df, generated)
 
-    group_cols = ["metric", "segment", "segment_type"]
-    for group_key, group in result.groupby(group_cols, dropna=False):
-        metric, segment, segment_type = group_key
-        group = group.sort_values("year").copy()
-        existing_years = set(int(y) for y in group["year"].tolist())
-        metric_default_growth = fallback_growth.get(metric, 0.0)
-
-        for year in range(min_year, max_year + 1):
-            if year in existing_years:
-                continue
 
-            history = group[group["year"] < year].sort_values("year")
-            if history.empty:
-                continue
+@dataclass(frozen=True)
+class SourceSignature:
+    mtime_ns: int
+    size: int
+    sha256: str
+
 
-            if len(history) >= 3 and history["value"].tail(3).min() > 0:
-                window = history.tail(3)
-                year_span = int(window.iloc[-1]["year"] - window.iloc[0]["year"])
-                if year_span > 0:
-                    growth_rate = (window.iloc[-1]["value"] / window.iloc[0]["value"]) ** (
-                        1 / year_span
-                    ) - 1
-                else:
-                    growth_rate = metric_default_growth
-                base_value = float(history.iloc[-1]["value"])
-                next_value = base_value * (1 + growth_rate)
-                method = "CAGR"
-            elif len(history) >= 2:
-                window = history.tail(2)
-                year_span = int(window.iloc[-1]["year"] - window.iloc[0]["year"])
-                if year_span <= 0:
-                    annual_delta = 0.0
-                else:
-                    annual_delta = (window.iloc[-1]["value"] - window.iloc[0]["value"]) / year_span
-                base_value = float(history.iloc[-1]["value"])
-                next_value = base_value + annual_delta
-                method = "linear"
+class IncrementalBuilder:
+    """
+    Keeps the previous build in memory and only redoes the parts whose
+    inputs changed.
+
+    Source files are tracked by (mtime, size) and, when those move, by a
+    content hash, so a plain touch does not trigger work. Only blocks of
+    changed files are rebuilt; the forecast re-runs only for groups whose
+    input rows changed or whose metric fallback growth moved.
+    """
+
+    _group_cols = ["metric", "segment", "segment_type"]
+
+    def __init__(self, data_dir: Path = DATA_DIR, chunksize: int = CSV_CHUNK_ROWS) -> None:
+        self.data_dir = Path(data_dir)
+        self.chunksize = chunksize
+        self._lock = threading.Lock()
+        self._signatures: dict[str, SourceSignature] = {}
+        self._blocks: dict[int, pd.DataFrame] = {}
+        self._group_hashes: pd.Series | None = None
+        self._fallback_growth: dict[str, float] = {}
+        self._generated: pd.DataFrame | None = None
+        self._horizon: tuple[int, int] | None = None
+        self.last_report: dict[str, Any] = {}
+
+    def _signature(self, frame: str) -> SourceSignature:
+        path = self.data_dir / BASE_FILES[frame]
+        stat = path.stat()
+        previous = self._signatures.get(frame)
+        if previous is not None and (previous.mtime_ns, previous.size) == (stat.st_mtime_ns, stat.st_size):
+            return previous
+        with path.open("rb") as handle:
+            digest = hashlib.file_digest(handle, "sha256").hexdigest()
+        return SourceSignature(stat.st_mtime_ns, stat.st_size, digest)
+
+    def build_local(self, profile: PipelineProfile | None = None) -> pd.DataFrame:
+        profile = PipelineProfile(trace_memory=False) if profile is None else profile
+        with self._lock:
+            with profile.stage("ingest_sources", rows_in=0) as stage:
+                rebuilt: list[str] = []
+                stage.rows_out = 0
+                for frame, specs in _specs_by_frame().items():
+                    signature = self._signature(frame)
+                    previous = self._signatures.get(frame)
+                    self._signatures[frame] = signature
+                    if previous is not None and previous.sha256 == signature.sha256:
+                        continue
+                    blocks, rows_read = stream_unified_blocks(
+                        self.data_dir / BASE_FILES[frame], [spec for _, spec in specs], self.chunksize
+                    )
+                    for (index, _), block in zip(specs, blocks):
+                        self._blocks[index] = block
+                    rebuilt.append(frame)
+                    stage.rows_in += rows_read
+                    stage.rows_out += sum(len(block) for block in blocks)
+
+            with profile.stage("build_unified_local", rows_in=stage.rows_out) as stage:
+                unified = _build_unified_local([self._blocks[index] for index in range(len(UNIFIED_SOURCE_SPECS))])
+                stage.rows_out = len(unified)
+            self.last_report = {"rebuilt_sources": sorted(rebuilt)}
+            return unified
+
+    def forecast(self, df: pd.DataFrame, min_year: int, max_year: int) -> pd.DataFrame:
+        if df.empty:
+            return df
+
+        with self._lock:
+            cols = self._group_cols
+            row_hashes = pd.util.hash_pandas_object(df[["year", "value", "data_status"]], index=False)
+            group_hashes = row_hashes.groupby([df[col] for col in cols], dropna=False).sum()
+            fallback_growth = _metric_fallback_growth(df)
+
+            full = self._generated is None or self._horizon != (min_year, max_year)
+            if full:
+                dirty_keys = group_hashes.index
             else:
-                base_value = float(history.iloc[-1]["value"])
-                next_value = base_value * (1 + metric_default_growth)
-                method = "fallback"
-
-            next_value = _clamp_metric(metric, float(next_value))
-            generated = {
-                "year": year,
-                "metric": metric,
-                "segment": segment,
-                "segment_type": segment_type,
-                "value": next_value,
-                "data_status": "estimated",
-                "source": f"Estimated ({method})",
+                previous = self._group_hashes
+                common = group_hashes.index.intersection(previous.index)
+                differs = previous.reindex(common).to_numpy() != group_hashes.reindex(common).to_numpy()
+                changed = group_hashes.index.difference(common).union(common[differs])
+                moved = {
+                    metric
+                    for metric in set(fallback_growth) | set(self._fallback_growth)
+                    if not _same_float(fallback_growth.get(metric), self._fallback_growth.get(metric))
+                }
+                by_metric = group_hashes.index[group_hashes.index.get_level_values("metric").isin(moved)]
+                dirty_keys = changed.union(by_metric)
+
+            dirty_rows = pd.MultiIndex.from_frame(df[cols]).isin(dirty_keys)
+            fresh = _forecast_missing_years(df[dirty_rows], fallback_growth, min_year, max_year)
+            if full:
+                generated = fresh
+            else:
+                # Keep earlier estimates only for groups that still exist and stayed clean.
+                kept_mask = pd.MultiIndex.from_frame(self._generated[cols]).isin(
+                    group_hashes.index.difference(dirty_keys)
+                )
+                parts = [self._generated[kept_mask]] + ([fresh] if not fresh.empty else [])
+                generated = pd.concat(parts, ignore_index=True)
+                generated = generated.sort_values(cols + ["year"], kind="stable").reset_index(drop=True)
+
+            self._group_hashes = group_hashes
+            self._fallback_growth = fallback_growth
+            self._generated = generated
+            self._horizon = (min_year, max_year)
+            self.last_report = {
+                **self.last_report,
+                "reforecast_groups": int(len(dirty_keys)),
+                "reused_groups": int(len(group_hashes) - len(dirty_keys)),
             }
-            generated_rows.append(generated)
-            group = pd.concat([group, pd.DataFrame([generated])], ignore_index=True).sort_values("year")
-            existing_years.add(year)
+            return _with_forecast_rows(df, generated)
+
+
+def _same_float(left: float | None, right: float | None) -> bool:
+    if left is None or right is None:
+        return left is right
+    return left == right or (np.isnan(left) and np.isnan(right))
 
-    if generated_rows:
-        result = pd.concat([result, pd.DataFrame(generated_rows)], ignore_index=True)
-    return result.sort_values(["metric", "segment", "year"]).reset_index(drop=True)
+
+_DEFAULT_BUILDER = IncrementalBuilder()
 
 
 def build_data_bundle(
-    timeout_s: int = 8,
+    timeout_s: float = 8,
     min_year: int = 2025,
     max_year: int = 2026,
+    builder: IncrementalBuilder | None = None,
+    offline: bool = False,
+    profile: PipelineProfile | None = None,
 ) -> dict[str, Any]:
-    base = load_base_data()
-    unified_local = _build_unified_local(base)
-    runtime_updates = fetch_runtime_updates(timeout_s=timeout_s)
-    runtime_df = runtime_updates.get("unified", pd.DataFrame())
-    unified_merged = merge_with_priority(unified_local, runtime_df)
-    unified = ensure_years_with_forecast(unified_merged, min_year=min_year, max_year=max_year)
-
-    status = "online" if not runtime_df.empty else "offline"
-    note = "Runtime updates from official pages applied." if status == "online" else "Offline mode (dados locais)."
+    """
+    Runs the full pipeline. offline=True makes no network requests; runtime
+    updates then come from the HTTP cache only.
+
+    The returned bundle carries a PipelineProfile under "profile" (per-stage
+    timings and row counts, per-URL fetch latency and status).
+    """
+    started = time.perf_counter()
+    profile = PipelineProfile() if profile is None else profile
+    builder = _DEFAULT_BUILDER if builder is None else builder
+    unified_local = builder.build_local(profile)
+
+    with profile.stage("fetch_runtime_updates") as stage:
+        runtime_updates = fetch_runtime_updates(timeout_s=timeout_s, offline=offline)
+        runtime_df = runtime_updates.get("unified", pd.DataFrame())
+        stage.rows_out = len(runtime_df)
+    sources_df = runtime_updates.get("sources", pd.DataFrame(columns=["outcome"]))
+    profile.record_fetches(sources_df.to_dict("records"))
+
+    with profile.stage("merge_with_priority", rows_in=len(unified_local) + len(runtime_df)) as stage:
+        unified_merged = merge_with_priority(unified_local, runtime_df)
+        stage.rows_out = len(unified_merged)
+    with profile.stage("ensure_years_with_forecast", rows_in=len(unified_merged)) as stage:
+        forecasted = builder.forecast(unified_merged, min_year=min_year, max_year=max_year)
+        stage.rows_out = len(forecasted)
+    with profile.stage("compact_unified", rows_in=len(forecasted)) as stage:
+        unified = compact_unified(forecasted)
+        stage.rows_out = len(unified)
+
+    outcomes = sources_df["outcome"]
+    if runtime_df.empty:
+        status = "offline"
+        note = "Offline mode (dados locais)."
+    elif outcomes.isin(["fresh", "revalidated"]).any():
+        status = "online"
+        note = "Runtime updates from official pages applied."
+    else:
+        status = "cached"
+        note = "Runtime updates served from the local HTTP cache (fontes indisponiveis)."
+    refreshed_utc = datetime.now(timezone.utc).isoformat()
+    profile.total_s = round(time.perf_counter() - started, 6)
     runtime_meta = RuntimeMeta(
         status=status,
-        last_refresh_utc=datetime.now(timezone.utc).isoformat(),
+        last_refresh_utc=refreshed_utc,
         source_count=len(RUNTIME_SOURCES),
         notes=note,
+        refresh_duration_s=round(profile.total_s, 3),
+        refresh_outcome="succeeded",
+        last_attempt_utc=refreshed_utc,
     )
 
     return {
         "unified": unified,
         "runtime_meta": runtime_meta,
         "runtime_sources": RUNTIME_SOURCES,
+        "version": bundle_version(unified),
+        "profile": profile,
     }
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from functools import lru_cache
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+GEOJSON_SOURCE_URL = (
+    "https://raw.githubusercontent.com/codeforamerica/click_that_hood/"
+    "master/public/data/brazil-states.geojson"
+)
+GEO_DIR = Path(__file__).parent / "data" / "geo"
+
+# Douglas-Peucker tolerance (degrees) per shipped level, coarsest first.
+SIMPLIFY_LEVELS: dict[str, float] = {
+    "low": 0.08,
+    "medium": 0.03,
+    "high": 0.008,
+}
+# Brazil spans roughly 39 degrees of latitude.
+_BRAZIL_LAT_SPAN = 39.0
+_COORD_DECIMALS = 3
+
+
+def geojson_path(level: str, directory: Path = GEO_DIR) -> Path:
+    return Path(directory) / f"brazil-states.{level}.geojson"
+
+
+def level_for_viewport(height_px: int, mobile: bool = False) -> str:
+    """
+    Coarsest level whose tolerance stays under half a screen pixel for a map
+    of the given height; simplification below that is invisible.
+    """
+    degrees_per_px = _BRAZIL_LAT_SPAN / max(1, height_px)
+    if mobile:
+        degrees_per_px *= 2
+    for level, tolerance in SIMPLIFY_LEVELS.items():
+        if tolerance <= degrees_per_px / 2:
+            return level
+    return next(reversed(SIMPLIFY_LEVELS))
+
+
+@lru_cache(maxsize=None)
+def load_brazil_geojson(level: str = "medium", directory: Path = GEO_DIR) -> dict[str, Any] | None:
+    """
+    Bundled state boundaries for one simplification level, parsed once per
+    process. Returns None, with a warning, when the assets have not been
+    built; the app never fetches GEOJSON_SOURCE_URL itself.
+    """
+    path = geojson_path(level, directory)
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as error:
+        logger.warning(
+            "GeoJSON asset %s unavailable (%s); run `python geo_assets.py` to build it. "
+            "Until then the map is replaced by a bar chart.",
+            path,
+            error,
+        )
+        return None
+
+
+def _simplify_line(points: np.ndarray, tolerance: float) -> np.ndarray:
+    # Iterative Douglas-Peucker over one coordinate sequence.
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        segment = points[end] - points[start]
+        inner = points[start + 1:end] - points[start]
+        length = np.hypot(*segment)
+        if length == 0:
+            distances = np.hypot(inner[:, 0], inner[:, 1])
+        else:
+            distances = np.abs(segment[0] * inner[:, 1] - segment[1] * inner[:, 0]) / length
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            split = start + 1 + farthest
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+    return points[keep]
+
+
+def _simplify_ring(ring: list[list[float]], tolerance: float) -> list[list[float]] | None:
+    points = np.asarray(ring, dtype=float)[:, :2]
+    simplified = _simplify_line(points, tolerance)
+    if len(simplified) < 4:
+        # Ring collapsed below a triangle: drop it (tiny islands at this scale).
+        return None
+    return np.round(simplified, _COORD_DECIMALS).tolist()
+
+
+def _simplify_polygon(rings: list, tolerance: float) -> list | None:
+    simplified = [_simplify_ring(ring, tolerance) for ring in rings]
+    if simplified[0] is None:
+        return None
+    return [ring for ring in simplified if ring is not None]
+
+
+def simplify_geojson(geojson: dict[str, Any], tolerance: float) -> dict[str, Any]:
+    """
+    Simplified copy of a Polygon/MultiPolygon FeatureCollection. Only the
+    properties the map uses (sigla, name) are kept.
+    """
+    features = []
+    for feature in geojson["features"]:
+        geometry = feature["geometry"]
+        if geometry["type"] == "Polygon":
+            polygons = [geometry["coordinates"]]
+        else:
+            polygons = geometry["coordinates"]
+        kept = [p for p in (_simplify_polygon(poly, tolerance) for poly in polygons) if p]
+        if not kept:
+            # Never lose a whole state: fall back to its largest polygon untouched.
+            kept = [max(polygons, key=lambda poly: len(poly[0]))]
+        properties = feature.get("properties", {})
+        features.append(
+            {
+                "type": "Feature",
+                "properties": {key: properties[key] for key in ("sigla", "name") if key in properties},
+                "geometry": {"type": "MultiPolygon", "coordinates": kept},
+            }
+        )
+    return {"type": "FeatureCollection", "features": features}
+
+
+def build_geo_assets(source: str = GEOJSON_SOURCE_URL, directory: Path = GEO_DIR) -> list[Path]:
+    """
+    Downloads (or reads, for a local path) the full-resolution boundaries
+    and writes one pre-simplified file per level.
+    """
+    if source.startswith(("http://", "https://")):
+        import requests
+
+        response = requests.get(source, timeout=30)
+        response.raise_for_status()
+        geojson = response.json()
+    else:
+        geojson = json.loads(Path(source).read_text(encoding="utf-8"))
+
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    written = []
+    for level, tolerance in SIMPLIFY_LEVELS.items():
+        path = geojson_path(level, directory)
+        simplified = simplify_geojson(geojson, tolerance)
+        path.write_text(json.dumps(simplified, separators=(",", ":")), encoding="utf-8")
+        written.append(path)
+    load_brazil_geojson.cache_clear()
+    return written
+
+
+if __name__ == "__main__":
+    import sys
+
+    for path in build_geo_assets(sys.argv[1] if len(sys.argv) > 1 else GEOJSON_SOURCE_URL):
+        print(f"{path} ({path.stat().st_size / 1024:.0f} KB)")
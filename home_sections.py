@@ -0,0 +1,364 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pandas as pd
+import streamlit as st
+
+from chart_cache import render_chart
+from charts import STATE_SELECTION
+from data_pipeline import (
+    METRIC_BREWERIES,
+    METRIC_CONCENTRATION_BREWERIES,
+    METRIC_CONCENTRATION_VOLUME,
+    METRIC_DENSITY_STATE,
+    METRIC_REGULAR_VOL,
+    METRIC_SPENDING,
+    METRIC_ZERO_SHARE,
+    METRIC_ZERO_VOL,
+)
+from metrics import compute_delta, compute_main_kpis, fmt_num
+from section_registry import SectionContext, section
+from ui_sections import render_choropleth_map, selected_value
+
+
+# Home sections in page order, one story step each (see render_story_stepper).
+# Loaders declare what a section reads; they run only when it is visible.
+
+
+@section("kpis", step=1, kpis=lambda ctx: compute_main_kpis(ctx.store, ctx.year))
+def kpis_section(ctx: SectionContext, data: dict[str, Any]) -> None:
+    st.markdown('<div class="section-title">📈 Indicadores Principais</div>', unsafe_allow_html=True)
+
+    kpis = data["kpis"]
+
+    # Grid 3x2
+    cols = st.columns(3)
+
+    for idx, kpi in enumerate(kpis):
+        col_idx = idx % 3
+
+        # Determine delta color
+        delta_val = kpi['delta'].get('pct_change', 0)
+        if delta_val is None or delta_val == 0:
+            delta_class = "kpi-delta-neutral"
+            arrow = "→"
+        elif delta_val > 0:
+            delta_class = "kpi-delta-positive"
+            arrow = "↗"
+        else:
+            delta_class = "kpi-delta-negative"
+            arrow = "↘"
+
+        delta_text = kpi['delta'].get('formatted', '0.0%')
+        status_badge = "🟢 Oficial" if kpi.get('status') == 'official' else "🔵 Estimado"
+
+        with cols[col_idx]:
+            st.markdown(f"""
+    <div class="kpi-card">
+        <div>
+            <div class="kpi-label">{kpi['label']}</div>
+            <div class="kpi-value">{kpi['formatted_value']}</div>
+        </div>
+        <div>
+            <div class="kpi-delta">
+                <span class="{delta_class}">{arrow} {delta_text}</span>
+            </div>
+            <div class="kpi-status">{status_badge}</div>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+
+@section("story", step=1)
+def story_section(ctx: SectionContext, data: dict[str, Any]) -> None:
+    st.markdown('<div class="section-title">📖 Descubra o Boom Zero</div>', unsafe_allow_html=True)
+
+    st.markdown("""
+    <div class="info-box" style="background: linear-gradient(135deg, rgba(16, 185, 129, 0.2), rgba(6, 182, 212, 0.2)); border-color: #10b981;">
+        <strong style="color: #10b981; font-size: 1.2rem;">🚀 A cerveja zero EXPLODIU no Brasil!</strong>
+        <p style="margin-top: 0.5rem;">
+        • <b>+537% em 2024:</b> 757 milhões de litros<br>
+        • <b>🏆 2º lugar mundial</b> em consumo de cerveja zero<br>
+        • <b>11,9 piscinas olímpicas</b> produzidas POR DIA
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.markdown("---")
+
+    # Pergunta 2: Como explicar?
+    st.markdown("### 🤯 Como explicar esse boom de 537%?")
+
+    with st.expander("🏃 **1. Tendência Global de Saúde e Bem-Estar**", expanded=True):
+        st.markdown("""
+        - Consumidores buscam **equilíbrio** entre prazer e saúde
+        - Movimento *sober curious* (curiosos pela sobriedade) cresce globalmente
+        - Zero álcool permite **socializar sem ressaca**
+        - Especialmente forte entre jovens 25-35 anos
+        """)
+
+    with st.expander("🌍 **2. Brasil = Mercado Estratégico Global**"):
+        st.markdown("""
+        - 🥈 **2º maior consumidor mundial** de cerveja zero (só perde para China)
+        - Ultrapassou os EUA em 2024
+        - Mercado de **R$ 4 bilhões** e crescendo
+        - Clima tropical favorece consumo o ano todo
+        """)
+
+    with st.expander("🏭 **3. Investimento Massivo das Marcas**"):
+        st.markdown("""
+        - **Heineken 0.0** chegou em 2020 e consolidou liderança
+        - **Ambev** reagiu forte: Budweiser Zero e Corona Cero (2022)
+        - Marcas cresceram **+20% em 2024** (vs +1% mercado total)
+        - Qualidade melhorou drasticamente (sabor próximo ao original)
+        """)
+
+    with st.expander("📱 **4. Mudança Cultural e Lei Seca**"):
+        st.markdown("""
+        - Lei Seca mais rigorosa desde 2008
+        - Cultura de **dirigir após beber** diminuiu
+        - Redes sociais valorizam **estilo de vida saudável**
+        - Cerveja zero = **sem culpa, com prazer**
+        """)
+
+    st.markdown("---")
+
+    st.markdown("### 🏆 Quem domina o mercado zero no Brasil?")
+
+    st.markdown("""
+    **Top 3 Marcas Zero (2024):**
+
+    🥇 **Heineken 0.0** - Líder
+    - Lançada em 2020
+    - Brasil = mercado estratégico global
+
+    🥈 **Budweiser Zero** - +20% em 2024
+    - Ambev (lançada em 2022)
+
+    🥉 **Corona Cero** - +20% em 2024
+    - Ambev (lançada em 2022)
+    """)
+
+
+def _market_share(ctx: SectionContext) -> pd.DataFrame:
+    # Dados de market share
+    return pd.DataFrame({
+        'Fabricante': ['Ambev', 'Heineken Brasil', 'Grupo Petrópolis', 'Outros'],
+        'Share': [59.3, 24.4, 11.3, 5.0],
+        'Marcas': ['Brahma, Skol, Bud, Corona', 'Heineken, Amstel', 'Itaipava, Petra', 'Artesanais']
+    })
+
+
+def _category_growth(ctx: SectionContext) -> pd.DataFrame:
+    return pd.DataFrame({
+        'Categoria': ['Cerveja Zero', 'Cervejas Premium', 'Mercado Total'],
+        'Crescimento': [20.0, 10.0, 1.0],
+        'Cor': ['#10b981', '#f59e0b', '#64748b']
+    })
+
+
+def _top_brands(ctx: SectionContext) -> pd.DataFrame:
+    return pd.DataFrame({
+        'Marca': ['Brahma', 'Heineken', 'Skol', 'Amstel', 'Budweiser'],
+        'Consumo': [43.1, 40.6, 36.6, 33.2, 28.8],
+        'Fabricante': ['Ambev', 'Heineken', 'Ambev', 'Heineken', 'Ambev']
+    })
+
+
+@section("brands", step=1, market_data=_market_share, growth_data=_category_growth, brands_data=_top_brands)
+def brands_section(ctx: SectionContext, data: dict[str, Any]) -> None:
+    st.markdown('<div class="section-title">🏢 Panorama do Mercado Brasileiro</div>', unsafe_allow_html=True)
+
+    tab1, tab2, tab3 = st.tabs(["📊 Market Share", "🚀 Crescimento Zero", "🏆 Top Marcas"])
+
+    with tab1:
+        st.markdown("**Distribuição do Mercado por Fabricante (2024)**")
+
+        render_chart("market_share_donut", data["market_data"], height=350)
+
+        st.markdown("""
+        <div class="info-box">
+            <strong>💡 Insight:</strong> Mercado concentrado mas em transformação.
+            Ambev mantém liderança histórica (59%), enquanto Heineken cresce forte (24%)
+            e Petrópolis surpreende com Petra em alta.
+        </div>
+        """, unsafe_allow_html=True)
+
+    with tab2:
+        st.markdown("**Crescimento Comparativo: Zero vs Premium vs Total (2024)**")
+
+        render_chart("growth_bars", data["growth_data"], height=300)
+
+        st.markdown("""
+        <div class="surprise-box">
+            <span class="surprise-emoji">🚀</span>
+            <strong style="color: #10b981;">Zero cresce 20x mais que o mercado total!</strong>
+            <p style="margin-top: 0.5rem; color: #a7f3d0;">
+            Enquanto o mercado total cresce apenas 1%, cerveja zero dispara com +20% em 2024.
+            Até cervejas premium (+10%) ficam para trás nessa corrida.
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with tab3:
+        st.markdown("**Top 5 Marcas Mais Consumidas no Brasil (2024)**")
+
+        render_chart("top_brands_bars", data["brands_data"], height=300)
+
+        st.caption("Fonte: Brazil Panels (2024)")
+
+
+@section(
+    "evolution",
+    step=2,
+    volume_df=lambda ctx: ctx.queries.select(METRIC_ZERO_VOL, ctx.statuses, segment="Brasil"),
+    share_df=lambda ctx: ctx.queries.select(METRIC_ZERO_SHARE, ctx.statuses, segment="Brasil"),
+    comp_df=lambda ctx: ctx.queries.select((METRIC_ZERO_VOL, METRIC_REGULAR_VOL), ctx.statuses, segment="Brasil"),
+)
+def evolution_section(ctx: SectionContext, data: dict[str, Any]) -> None:
+    st.markdown('<div class="section-title">📈 Evolução do Mercado Zero</div>', unsafe_allow_html=True)
+
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        st.markdown("**📈 Volume de Cerveja Zero: Crescimento Explosivo**")
+        st.caption("💡 2024 = 11,9 piscinas olímpicas produzidas por dia!")
+
+        render_chart("zero_volume_line", data["volume_df"], height=380)
+
+    with col2:
+        st.markdown("**📊 Market Share**")
+        st.caption("🎯 Caminho para 10% até 2028")
+
+        render_chart("zero_share_area", data["share_df"], height=380)
+
+    # Surprise Insight
+    st.markdown("""
+    <div class="surprise-box">
+        <span class="surprise-emoji">💰</span>
+        <strong style="color: #fbbf24; font-size: 1.2rem;">Mercado Vale R$ 4 Bilhões</strong>
+        <p style="color: #fcd34d; margin-top: 0.5rem;">Equivalente a 15 estádios do Maracanã lotados com ingressos de R$ 100 cada!</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Comparison
+    st.markdown("**⚖️ Batalha de Gigantes: Zero vs. Tradicional**")
+    st.caption("A cerveja zero cresce enquanto a tradicional se mantém estável")
+
+    render_chart("zero_vs_regular_lines", data["comp_df"], height=350)
+
+
+def _density_map(ctx: SectionContext) -> pd.DataFrame:
+    density_df = ctx.queries.select(METRIC_DENSITY_STATE, ctx.statuses, year=2024)
+    return density_df[["segment", "value"]].rename(columns={"segment": "state", "value": "density"})
+
+
+@section(
+    "geography",
+    step=3,
+    fragment=True,
+    map_df=_density_map,
+    brew_state=lambda ctx: ctx.queries.select(
+        METRIC_BREWERIES, ctx.statuses, segment_type="state", year=ctx.year, top_n=10
+    ),
+    # Remover "Outros"
+    spending_df=lambda ctx: ctx.queries.select(
+        METRIC_SPENDING, ctx.statuses, segment_type="state", year=2025,
+        exclude_segments=("Outros",), top_n=10,
+    ),
+)
+def geography_section(ctx: SectionContext, data: dict[str, Any]) -> None:
+    st.markdown('<div class="section-title">🌍 Geografia Cervejeira do Brasil</div>', unsafe_allow_html=True)
+
+    st.markdown("**🗺️ Densidade de Cervejarias: O Mapa da Oportunidade**")
+    st.caption("Sul = Saturação | Norte/Nordeste = Deserto de oportunidades")
+
+    if not data["map_df"].empty:
+        render_choropleth_map(data["map_df"], "density", "state", "Cervejarias / 100k hab")
+
+    st.markdown("""
+    <div class="surprise-box">
+        <span class="surprise-emoji">🌊</span>
+        <strong style="color: #06b6d4; font-size: 1.2rem;">Deserto Cervejeiro</strong>
+        <p style="color: #67e8f9; margin-top: 0.5rem;">Norte: 1 cervejaria para cada 200 mil pessoas | Sul: 1 para cada 32 mil! 6x mais oportunidades no Norte!</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.markdown("**🏆 Rankings por Estado**")
+
+    picked_state = None
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("*Top 10: Número de Cervejarias*")
+
+        if not data["brew_state"].empty:
+            event = render_chart(
+                "state_breweries_bars", data["brew_state"], height=320,
+                key="state_breweries_pick", on_select="rerun", selection_mode=STATE_SELECTION,
+            )
+            picked_state = selected_value(event, "segment")
+
+    with col2:
+        st.markdown("*Top 10: Gasto com Cerveja (R$ bi)*")
+
+        if not data["spending_df"].empty:
+            render_chart("state_spending_bars", data["spending_df"], height=320)
+
+    if picked_state is None:
+        st.caption("Clique em uma barra para ver o detalhe do estado.")
+    else:
+        _state_detail(ctx, picked_state)
+
+
+def _state_detail(ctx: SectionContext, state: str) -> None:
+    breweries = ctx.store.get(METRIC_BREWERIES, state, ctx.year)
+    previous = ctx.store.get(METRIC_BREWERIES, state, ctx.year - 1)
+    spending = ctx.store.get(METRIC_SPENDING, state, 2025)
+    delta = compute_delta(breweries, previous)
+
+    st.markdown(f"**📍 {state}**")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric(
+            f"Cervejarias ({ctx.year})",
+            fmt_num(breweries, 0),
+            None if delta["pct_change"] is None else f"{delta['formatted']} vs {ctx.year - 1}",
+        )
+    with col2:
+        st.metric("Gasto com cerveja (R$ bi, 2025)", fmt_num(spending))
+
+
+@section(
+    "concentration",
+    step=3,
+    conc_vol=lambda ctx: ctx.queries.select(METRIC_CONCENTRATION_VOLUME, ctx.statuses, year=2024),
+    conc_brew=lambda ctx: ctx.queries.select(METRIC_CONCENTRATION_BREWERIES, ctx.statuses, year=2024),
+)
+def concentration_section(ctx: SectionContext, data: dict[str, Any]) -> None:
+    st.markdown('<div class="section-title">🎯 Estrutura do Mercado: Tsunami Artesanal</div>', unsafe_allow_html=True)
+
+    st.markdown("""
+    <div class="surprise-box">
+        <span class="surprise-emoji">🌊</span>
+        <strong style="color: #a78bfa; font-size: 1.2rem;">Tsunami Artesanal</strong>
+        <p style="color: #c4b5fd; margin-top: 0.5rem;">99% das cervejarias (artesanais) produzem apenas 5% do volume. 1% (grandes marcas) domina 50%! David vs Golias cervejeiro.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("**📊 Distribuição do Volume Produzido**")
+        st.caption("Quem produz quanto?")
+
+        if not data["conc_vol"].empty:
+            render_chart("concentration_volume_donut", data["conc_vol"], height=300)
+
+    with col2:
+        st.markdown("**🏭 Distribuição de Estabelecimentos**")
+        st.caption("Número de cervejarias")
+
+        if not data["conc_brew"].empty:
+            render_chart("concentration_breweries_donut", data["conc_brew"], height=300)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import html
+import re
+from typing import Iterable
+
+
+BREWERY_COUNT_PATTERN = re.compile(r"(\d{1,3}(?:[.,]\d{3})+|\d{3,4})\s+(?:cervejarias|estabelecimentos)")
+_WHITESPACE = re.compile(r"\s+")
+_TAG = re.compile(r"<[^>]*>")
+_SKIPPED_BLOCK = re.compile(r"<(script|style|noscript|template)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_SKIPPED_OPEN = re.compile(r"<(?:script|style|noscript|template)\b", re.IGNORECASE)
+_MAX_ENTITY_CHARS = 32
+# Text kept between scans so a match split across two chunks is still found.
+_OVERLAP_CHARS = 96
+
+
+@dataclass(frozen=True)
+class ExtractionRule:
+    """
+    How to pull one number out of a runtime page. pattern runs over the
+    page text (tags removed, whitespace collapsed, lowercased) and its first
+    group is the number. Candidates outside [min_value, max_value] are
+    skipped; scanning stops after max_matches accepted candidates (the
+    largest one wins) or once max_chars of markup have been read.
+    """
+
+    year: int
+    pattern: re.Pattern[str] = BREWERY_COUNT_PATTERN
+    min_value: float | None = None
+    max_value: float | None = None
+    max_matches: int = 1
+    max_chars: int = 2_000_000
+
+
+def _parse_count(token: str) -> float | None:
+    # The pattern only admits [.,] before groups of three digits: thousands separators.
+    try:
+        return float(re.sub(r"[.,]", "", token))
+    except ValueError:
+        return None
+
+
+class _TextScanner:
+    """
+    Turns markup fed in arbitrary chunks into visible text (tags replaced by
+    a space, script/style dropped, entities decoded) and scans it for
+    rule.pattern. A tag, entity or script block cut by a chunk boundary is
+    carried over to the next chunk; only a short tail of text is kept.
+    """
+
+    def __init__(self, rule: ExtractionRule) -> None:
+        self.rule = rule
+        self.values: list[float] = []
+        self._carry = ""
+        self._window = ""
+        self._window_start = 0  # Text offset of _window[0].
+        self._scanned_until = 0  # Text offset past the last match seen.
+
+    @property
+    def done(self) -> bool:
+        return len(self.values) >= self.rule.max_matches
+
+    def feed(self, chunk: str, final: bool = False) -> None:
+        markup = self._carry + chunk
+        cut = len(markup)
+        if not final:
+            open_tag = markup.rfind("<")
+            if open_tag != -1 and markup.find(">", open_tag) == -1:
+                cut = open_tag
+            entity = markup.rfind("&", max(0, cut - _MAX_ENTITY_CHARS), cut)
+            if entity != -1 and ";" not in markup[entity:cut]:
+                cut = entity
+        head = _SKIPPED_BLOCK.sub(" ", markup[:cut])
+        unclosed = None if final else _SKIPPED_OPEN.search(head)
+        if unclosed is not None:
+            self._carry = head[unclosed.start():] + markup[cut:]
+            head = head[: unclosed.start()]
+        else:
+            self._carry = markup[cut:]
+        self._scan(_WHITESPACE.sub(" ", html.unescape(_TAG.sub(" ", head))).lower())
+
+    def _scan(self, text: str) -> None:
+        window = self._window + text
+        window_start = self._window_start
+        for match in self.rule.pattern.finditer(window):
+            if window_start + match.start() < self._scanned_until:
+                continue
+            self._scanned_until = window_start + match.end()
+            value = _parse_count(match.group(1))
+            if value is None:
+                continue
+            if self.rule.min_value is not None and value < self.rule.min_value:
+                continue
+            if self.rule.max_value is not None and value > self.rule.max_value:
+                continue
+            self.values.append(value)
+            if self.done:
+                return
+        keep = min(len(window), _OVERLAP_CHARS)
+        self._window = window[len(window) - keep:]
+        self._window_start = window_start + len(window) - keep
+
+
+def extract_value(chunks: Iterable[str], rule: ExtractionRule) -> tuple[float | None, str]:
+    """
+    Feeds markup chunks to the scanner and returns (value,
+    markup read). Stops pulling chunks as soon as the rule is satisfied or
+    its max_chars budget is spent, so the rest of the page is never read.
+    """
+    scanner = _TextScanner(rule)
+    read: list[str] = []
+    read_chars = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        chunk = chunk[: rule.max_chars - read_chars]
+        read.append(chunk)
+        read_chars += len(chunk)
+        scanner.feed(chunk)
+        if scanner.done or read_chars >= rule.max_chars:
+            break
+    else:
+        scanner.feed("", final=True)
+    value = max(scanner.values) if scanner.values else None
+    return value, "".join(read)
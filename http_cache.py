@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+from typing import Any
+
+
+HTTP_CACHE_DIR = Path(
+    os.environ.get("CERVEJA_HTTP_CACHE_DIR", Path(__file__).parent / ".cache" / "http")
+)
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    url: str
+    body: str
+    etag: str | None
+    last_modified: str | None
+    fetched_utc: str
+    parsed: dict[str, Any] | None
+
+
+class HttpCache:
+    """
+    Disk-backed response cache shared by every process that points at the
+    same directory. One JSON file per URL, replaced atomically on write.
+    """
+
+    def __init__(self, directory: Path | str = HTTP_CACHE_DIR) -> None:
+        self.directory = Path(directory)
+
+    def _path(self, url: str) -> Path:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        return self.directory / f"{digest}.json"
+
+    def load(self, url: str) -> CachedResponse | None:
+        try:
+            payload = json.loads(self._path(url).read_text(encoding="utf-8"))
+            entry = CachedResponse(**payload)
+        except (OSError, ValueError, TypeError):
+            return None
+        return entry if entry.url == url else None
+
+    def store(self, entry: CachedResponse) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(asdict(entry), handle, ensure_ascii=False)
+            os.replace(tmp_name, self._path(entry.url))
+        except OSError:
+            # A read-only or full disk only costs us the cache, never the fetch.
+            return
+
+    @staticmethod
+    def conditional_headers(entry: CachedResponse | None) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
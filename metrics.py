@@ -1,7 +1,10 @@
 from __future__ import annotations
 
-from typing import Any
+from dataclasses import dataclass
+import hashlib
+from typing import Any, Iterable, Sequence
 
+import numpy as np
 import pandas as pd
 
 from data_pipeline import (
@@ -14,7 +17,13 @@ from data_pipeline import (
     METRIC_PER_CAPITA,
     METRIC_TRADE_EXPORT_VOL,
     METRIC_GLOBAL_RANK_ZERO,
+    UNIFIED_COLUMNS,
 )
+from memo import BoundedLRU
+
+
+SCENARIO_YEARS = (2025, 2026)
+SCENARIO_VOLUME_METRICS = (METRIC_ZERO_VOL, METRIC_REGULAR_VOL, METRIC_TOTAL_VOL, METRIC_ZERO_SHARE)
 
 
 def safe_ratio(numerator: float | None, denominator: float | None) -> float | None:
@@ -43,136 +52,381 @@ def fmt_num(value: float | None, decimals: int = 1) -> str:
     return f"{value:.{decimals}f}"
 
 
+class MetricStore:
+    """
+    Indexed, read-only view over the unified long table.
+
+    Built once per bundle; every (metric, segment, year) lookup is a dict hit
+    instead of a boolean mask over the whole frame. version identifies the
+    data the store was built from (bundle version plus any filters); results
+    derived from a store without one are never memoized.
+    """
+
+    key_columns = ["metric", "segment", "year"]
+
+    def __init__(self, unified_df: pd.DataFrame, version: str | None = None) -> None:
+        self.df = unified_df
+        self.version = version
+        # First row wins on duplicate keys, matching the old iloc[0] lookup.
+        keyed = unified_df.drop_duplicates(subset=self.key_columns, keep="first")
+        keys = zip(
+            keyed["metric"].tolist(),
+            keyed["segment"].tolist(),
+            keyed["year"].astype(int).tolist(),
+        )
+        self._index: dict[tuple[str, str, int], tuple[float, str]] = dict(
+            zip(keys, zip(keyed["value"].astype(float).tolist(), keyed["data_status"].tolist()))
+        )
+        self._series = (
+            keyed.assign(year=keyed["year"].astype(int))
+            .set_index(self.key_columns)["value"]
+            .astype(float)
+            .sort_index()
+        )
+        self._build_dense(keyed)
+
+    def _build_dense(self, keyed: pd.DataFrame) -> None:
+        # (metric, segment) x contiguous-year grid for batched lookups.
+        pairs = pd.MultiIndex.from_arrays([keyed["metric"].astype(str), keyed["segment"].astype(str)])
+        codes, uniques = pd.factorize(pairs)
+        years = keyed["year"].to_numpy(dtype=np.int64)
+        self._first_year = int(years.min()) if len(years) else 0
+        width = int(years.max()) - self._first_year + 1 if len(years) else 0
+        self._pair_rows: dict[tuple[str, str], int] = {pair: row for row, pair in enumerate(uniques)}
+        self._dense_values = np.full((len(uniques), width), np.nan)
+        self._dense_status = np.full((len(uniques), width), None, dtype=object)
+        self._dense_values[codes, years - self._first_year] = keyed["value"].to_numpy(dtype=float)
+        self._dense_status[codes, years - self._first_year] = keyed["data_status"].astype(str).to_numpy(dtype=object)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: tuple[str, str, int]) -> bool:
+        return key in self._index
+
+    def get(self, metric: str, segment: str, year: int) -> float | None:
+        entry = self._index.get((metric, segment, int(year)))
+        return None if entry is None else entry[0]
+
+    def status(self, metric: str, segment: str, year: int) -> str | None:
+        entry = self._index.get((metric, segment, int(year)))
+        return None if entry is None else entry[1]
+
+    def get_many(self, keys: Iterable[tuple[str, str, int]]) -> list[float | None]:
+        index = self._index
+        values: list[float | None] = []
+        for metric, segment, year in keys:
+            entry = index.get((metric, segment, int(year)))
+            values.append(None if entry is None else entry[0])
+        return values
+
+    def series(
+        self,
+        metric: str,
+        segment: str,
+        years: Iterable[int] | None = None,
+    ) -> pd.Series:
+        """
+        Returns the values of one (metric, segment) pair indexed by year.
+        When years is given the result is reindexed to it (missing -> NaN).
+        """
+        try:
+            values = self._series.xs((metric, segment), level=["metric", "segment"])
+        except KeyError:
+            values = pd.Series(dtype=float, index=pd.Index([], name="year", dtype=int))
+        if years is not None:
+            values = values.reindex(pd.Index([int(y) for y in years], name="year"))
+        return values
+
+    def matrix(
+        self,
+        pairs: Iterable[tuple[str, str]],
+        years: Iterable[int],
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Dense (pair x year) values and statuses for the given (metric, segment)
+        pairs, gathered in one step. Absent cells are NaN / None.
+        """
+        rows = np.array([self._pair_rows.get(pair, -1) for pair in pairs], dtype=np.intp)
+        cols = np.array([int(year) for year in years], dtype=np.intp) - self._first_year
+        width = self._dense_values.shape[1]
+        present = (rows[:, None] >= 0) & (cols[None, :] >= 0) & (cols[None, :] < width)
+        if not present.any():
+            return (
+                np.full(present.shape, np.nan),
+                np.full(present.shape, None, dtype=object),
+            )
+        take_rows = np.where(rows >= 0, rows, 0)[:, None]
+        take_cols = np.where(present.any(axis=0), cols, 0)[None, :]
+        values = np.where(present, self._dense_values[take_rows, take_cols], np.nan)
+        statuses = np.where(present, self._dense_status[take_rows, take_cols], None)
+        return values, statuses
+
+    def rows(
+        self,
+        metric: str,
+        year: int | None = None,
+        segment_type: str | None = None,
+    ) -> pd.DataFrame:
+        df = self.df
+        mask = df["metric"] == metric
+        if year is not None:
+            mask &= df["year"] == year
+        if segment_type is not None:
+            mask &= df["segment_type"] == segment_type
+        return df[mask]
+
+
 def _get_value(
-    df: pd.DataFrame,
+    store: MetricStore,
     metric: str,
     segment: str,
     year: int,
 ) -> float | None:
-    row = df[
-        (df["metric"] == metric)
-        & (df["segment"] == segment)
-        & (df["year"] == year)
-    ]
-    if row.empty:
-        return None
-    return float(row.iloc[0]["value"])
+    return store.get(metric, segment, year)
 
 
-def _set_value(
-    df: pd.DataFrame,
-    metric: str,
-    segment: str,
-    segment_type: str,
-    year: int,
-    value: float,
-    data_status: str = "estimated",
-    source: str = "Scenario simulation",
-) -> pd.DataFrame:
-    mask = (
-        (df["metric"] == metric)
-        & (df["segment"] == segment)
-        & (df["year"] == year)
+def _upsert_values(df: pd.DataFrame, updates: pd.DataFrame) -> pd.DataFrame:
+    """
+    Writes every row of updates into df in one pass: rows whose
+    (metric, segment, year) already exist are overwritten in place (all
+    duplicates), the rest are appended in the order they first appear.
+    For repeated keys in updates the last value wins.
+    """
+    key_columns = MetricStore.key_columns
+    updates = updates.reset_index(drop=True)
+    first_seen = ~updates.duplicated(subset=key_columns, keep="first")
+    latest = updates.drop_duplicates(subset=key_columns, keep="last").set_index(key_columns)
+    ordered_keys = pd.MultiIndex.from_frame(updates.loc[first_seen, key_columns])
+    updates = latest.reindex(ordered_keys).reset_index()[UNIFIED_COLUMNS]
+
+    for column in ["metric", "segment", "segment_type", "data_status", "source"]:
+        _ensure_categories(df, column, updates[column].unique().tolist())
+
+    df_keys = pd.MultiIndex.from_arrays(
+        [df["metric"].astype(str), df["segment"].astype(str), df["year"].astype(int)]
     )
-    if mask.any():
-        df.loc[mask, "value"] = value
-        df.loc[mask, "data_status"] = data_status
-        df.loc[mask, "source"] = source
+    update_keys = pd.MultiIndex.from_arrays(
+        [updates["metric"].astype(str), updates["segment"].astype(str), updates["year"].astype(int)]
+    )
+    positions = update_keys.get_indexer(df_keys)
+    hit = positions >= 0
+    if hit.any():
+        matched = updates.iloc[positions[hit]]
+        df.loc[hit, "value"] = matched["value"].to_numpy().astype(df["value"].dtype)
+        for column in ["data_status", "source"]:
+            df.loc[hit, column] = matched[column].to_numpy()
+
+    is_new = ~update_keys.isin(df_keys)
+    if not is_new.any():
         return df
+    new_rows = updates[is_new].astype(df.dtypes.to_dict())
+    return pd.concat([df, new_rows], ignore_index=True)
 
-    new_row = pd.DataFrame(
-        [
-            {
-                "year": year,
-                "metric": metric,
-                "segment": segment,
-                "segment_type": segment_type,
-                "value": value,
-                "data_status": data_status,
-                "source": source,
-            }
-        ]
+
+def _ensure_categories(df: pd.DataFrame, column: str, values: list[str]) -> None:
+    # The compact unified schema uses categoricals; new labels must be registered before writing.
+    series = df[column]
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        missing = [value for value in values if value not in series.cat.categories]
+        if missing:
+            df[column] = series.cat.add_categories(missing)
+
+
+@dataclass(frozen=True)
+class ScenarioGrid:
+    """
+    Result of simulate_scenarios for N parameter combinations.
+
+    Volume arrays are (N, len(years)); spending_2026 is (N, len(states)).
+    volume_written is (len(SCENARIO_VOLUME_METRICS), len(years)) and flags
+    the volume values the scenario actually writes (it skips a year when the
+    base data it grows from is missing).
+    """
+
+    growth_zero_pct: np.ndarray
+    regular_variation_pct: np.ndarray
+    spending_elasticity_pct: np.ndarray
+    years: tuple[int, ...]
+    volume_written: np.ndarray
+    zero: np.ndarray
+    regular: np.ndarray
+    total: np.ndarray
+    share: np.ndarray
+    states: tuple[str, ...]
+    spending_2026: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.growth_zero_pct)
+
+    def summary(self) -> pd.DataFrame:
+        """
+        One row per combination with the headline outputs, ready for heatmaps.
+        """
+        columns: dict[str, Any] = {
+            "growth_zero_pct": self.growth_zero_pct,
+            "regular_variation_pct": self.regular_variation_pct,
+            "spending_elasticity_pct": self.spending_elasticity_pct,
+        }
+        for index, year in enumerate(self.years):
+            columns[f"zero_{year}"] = self.zero[:, index]
+            columns[f"total_{year}"] = self.total[:, index]
+            columns[f"share_{year}"] = self.share[:, index]
+        columns["spending_total_2026"] = np.nansum(self.spending_2026, axis=1)
+        return pd.DataFrame(columns)
+
+
+def simulate_scenarios(
+    store: MetricStore,
+    growth_zero_pct: Iterable[float] | float,
+    regular_variation_pct: Iterable[float] | float,
+    spending_elasticity_pct: Iterable[float] | float,
+    product: bool = True,
+) -> ScenarioGrid:
+    """
+    Vectorized scenario engine. With product=True the three parameter lists
+    are crossed (cartesian grid); otherwise they are broadcast element-wise.
+    Semantics match apply_scenario for every combination.
+    """
+    params = [np.atleast_1d(np.asarray(p, dtype=float)) for p in
+              (growth_zero_pct, regular_variation_pct, spending_elasticity_pct)]
+    if product:
+        params = [grid.ravel() for grid in np.meshgrid(*params, indexing="ij")]
+    else:
+        params = [np.ravel(p) for p in np.broadcast_arrays(*params)]
+    growth_pct, regular_pct, spending_pct = params
+    n_scenarios = len(growth_pct)
+    growth_zero = growth_pct / 100.0
+    regular_change = regular_pct / 100.0
+    spending_change = spending_pct / 100.0
+
+    years = SCENARIO_YEARS
+    shape = (n_scenarios, len(years))
+    zero = np.full(shape, np.nan)
+    regular = np.full(shape, np.nan)
+    total = np.full(shape, np.nan)
+    share = np.full(shape, np.nan)
+
+    def base(metric: str, year: int) -> np.ndarray | None:
+        value = store.get(metric, "Brasil", year)
+        return None if value is None else np.full(n_scenarios, value)
+
+    volume_written = np.zeros((len(SCENARIO_VOLUME_METRICS), len(years)), dtype=bool)
+    prev_zero = base(METRIC_ZERO_VOL, years[0] - 1)
+    prev_regular = base(METRIC_REGULAR_VOL, years[0] - 1)
+    for index, year in enumerate(years):
+        # np.fmax keeps Python's max(0.0, nan) == 0.0 behaviour.
+        volume_written[0, index] = prev_zero is not None
+        volume_written[1, index] = prev_regular is not None
+        zero_value = (
+            np.fmax(0.0, prev_zero * (1 + growth_zero)) if prev_zero is not None
+            else base(METRIC_ZERO_VOL, year)
+        )
+        regular_value = (
+            np.fmax(0.0, prev_regular * (1 + regular_change)) if prev_regular is not None
+            else base(METRIC_REGULAR_VOL, year)
+        )
+        if zero_value is not None:
+            zero[:, index] = zero_value
+        if regular_value is not None:
+            regular[:, index] = regular_value
+        if zero_value is not None and regular_value is not None:
+            total_value = np.fmax(0.0, zero_value + regular_value)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                share_value = np.where(total_value > 0, zero_value / total_value * 100, 0.0)
+            total[:, index] = total_value
+            share[:, index] = np.fmin(100.0, np.fmax(0.0, share_value))
+            volume_written[2:, index] = True
+        prev_zero, prev_regular = zero_value, regular_value
+
+    spending_2025 = store.rows(METRIC_SPENDING, year=2025)
+    states = tuple(str(segment) for segment in spending_2025["segment"].tolist())
+    base_spending = spending_2025["value"].to_numpy(dtype=float)
+    spending_2026 = np.fmax(0.0, base_spending[np.newaxis, :] * (1 + spending_change[:, np.newaxis]))
+
+    return ScenarioGrid(
+        growth_zero_pct=growth_pct,
+        regular_variation_pct=regular_pct,
+        spending_elasticity_pct=spending_pct,
+        years=years,
+        volume_written=volume_written,
+        zero=zero,
+        regular=regular,
+        total=total,
+        share=share,
+        states=states,
+        spending_2026=spending_2026,
     )
-    return pd.concat([df, new_row], ignore_index=True)
 
 
 def apply_scenario(
-    unified_df: pd.DataFrame,
+    store: MetricStore,
     growth_zero_pct: float,
     regular_variation_pct: float,
     spending_elasticity_pct: float,
 ) -> pd.DataFrame:
-    df = unified_df.copy()
-    growth_zero = growth_zero_pct / 100.0
-    regular_change = regular_variation_pct / 100.0
-    spending_change = spending_elasticity_pct / 100.0
-
-    # Apply scenario to 2025 and 2026 for volume.
-    for year in [2025, 2026]:
-        prev_year = year - 1
-        prev_zero = _get_value(df, METRIC_ZERO_VOL, "Brasil", prev_year)
-        prev_regular = _get_value(df, METRIC_REGULAR_VOL, "Brasil", prev_year)
-        if prev_zero is not None:
-            new_zero = max(0.0, prev_zero * (1 + growth_zero))
-            df = _set_value(df, METRIC_ZERO_VOL, "Brasil", "country", year, new_zero)
-        if prev_regular is not None:
-            new_regular = max(0.0, prev_regular * (1 + regular_change))
-            df = _set_value(df, METRIC_REGULAR_VOL, "Brasil", "country", year, new_regular)
-
-        zero_value = _get_value(df, METRIC_ZERO_VOL, "Brasil", year)
-        regular_value = _get_value(df, METRIC_REGULAR_VOL, "Brasil", year)
-        if zero_value is not None and regular_value is not None:
-            total_value = max(0.0, zero_value + regular_value)
-            share_value = (zero_value / total_value * 100) if total_value > 0 else 0.0
-            df = _set_value(df, METRIC_TOTAL_VOL, "Brasil", "country", year, total_value)
-            df = _set_value(
-                df,
-                METRIC_ZERO_SHARE,
-                "Brasil",
-                "country",
-                year,
-                min(100.0, max(0.0, share_value)),
-            )
-
-    # Spending elasticity affects 2026 against 2025 for each state.
-    spending_2025 = df[(df["metric"] == METRIC_SPENDING) & (df["year"] == 2025)]
-    for _, row in spending_2025.iterrows():
-        segment = str(row["segment"])
-        value_2026 = max(0.0, float(row["value"]) * (1 + spending_change))
-        df = _set_value(df, METRIC_SPENDING, segment, "state", 2026, value_2026)
+    grid = simulate_scenarios(store, growth_zero_pct, regular_variation_pct, spending_elasticity_pct)
+    volumes = [grid.zero, grid.regular, grid.total, grid.share]
+    rows: list[dict[str, Any]] = []
+    for index, year in enumerate(grid.years):
+        for position, metric in enumerate(SCENARIO_VOLUME_METRICS):
+            if grid.volume_written[position, index]:
+                rows.append(
+                    {
+                        "year": year,
+                        "metric": metric,
+                        "segment": "Brasil",
+                        "segment_type": "country",
+                        "value": float(volumes[position][0, index]),
+                    }
+                )
+    for state, value in zip(grid.states, grid.spending_2026[0]):
+        rows.append(
+            {
+                "year": 2026,
+                "metric": METRIC_SPENDING,
+                "segment": state,
+                "segment_type": "state",
+                "value": float(value),
+            }
+        )
 
-    return df
+    df = store.df.copy()
+    if not rows:
+        return df
+    updates = pd.DataFrame(rows).assign(data_status="estimated", source="Scenario simulation")
+    return _upsert_values(df, updates[UNIFIED_COLUMNS])
 
 
 def compute_insights(
-    unified_df: pd.DataFrame,
+    store: MetricStore,
     selected_year: int,
     selected_state: str | None,
 ) -> list[dict[str, str]]:
     year_base = selected_year
     year_prev = max(2024, selected_year - 1)
 
-    zero_selected = _get_value(unified_df, METRIC_ZERO_VOL, "Brasil", year_base)
-    zero_prev = _get_value(unified_df, METRIC_ZERO_VOL, "Brasil", year_prev)
+    zero_selected = _get_value(store, METRIC_ZERO_VOL, "Brasil", year_base)
+    zero_prev = _get_value(store, METRIC_ZERO_VOL, "Brasil", year_prev)
     zero_ratio = safe_ratio(zero_selected, zero_prev)
 
-    share_selected = _get_value(unified_df, METRIC_ZERO_SHARE, "Brasil", year_base)
-    share_prev = _get_value(unified_df, METRIC_ZERO_SHARE, "Brasil", year_prev)
+    share_selected = _get_value(store, METRIC_ZERO_SHARE, "Brasil", year_base)
+    share_prev = _get_value(store, METRIC_ZERO_SHARE, "Brasil", year_prev)
     share_delta = None
     if share_selected is not None and share_prev is not None:
         share_delta = share_selected - share_prev
 
-    brewers_2026 = _get_value(unified_df, METRIC_BREWERIES, "Brasil", 2026)
-    brewers_2024 = _get_value(unified_df, METRIC_BREWERIES, "Brasil", 2024)
+    brewers_2026 = _get_value(store, METRIC_BREWERIES, "Brasil", 2026)
+    brewers_2024 = _get_value(store, METRIC_BREWERIES, "Brasil", 2024)
     brewers_ratio = safe_ratio(brewers_2026, brewers_2024)
 
-    sp_spending_2025 = _get_value(unified_df, METRIC_SPENDING, "São Paulo", 2025)
-    mg_spending_2025 = _get_value(unified_df, METRIC_SPENDING, "Minas Gerais", 2025)
+    sp_spending_2025 = _get_value(store, METRIC_SPENDING, "São Paulo", 2025)
+    mg_spending_2025 = _get_value(store, METRIC_SPENDING, "Minas Gerais", 2025)
     sp_vs_mg = safe_ratio(sp_spending_2025, mg_spending_2025)
 
     state_label = selected_state if selected_state else "São Paulo"
-    state_brew_2026 = _get_value(unified_df, METRIC_BREWERIES, state_label, 2026)
-    state_brew_2024 = _get_value(unified_df, METRIC_BREWERIES, state_label, 2024)
+    state_brew_2026 = _get_value(store, METRIC_BREWERIES, state_label, 2026)
+    state_brew_2024 = _get_value(store, METRIC_BREWERIES, state_label, 2024)
     state_growth_ratio = safe_ratio(state_brew_2026, state_brew_2024)
 
     insights = [
@@ -205,7 +459,8 @@ def compute_insights(
     return insights
 
 
-def state_options(unified_df: pd.DataFrame) -> list[str]:
+def state_options(store: MetricStore) -> list[str]:
+    unified_df = store.df
     rows = unified_df[
         (unified_df["segment_type"] == "state")
         & (
@@ -218,7 +473,7 @@ def state_options(unified_df: pd.DataFrame) -> list[str]:
 
 
 def compute_benchmark(
-    unified_df: pd.DataFrame,
+    store: MetricStore,
     state_a: str,
     state_b: str,
     year_base: int,
@@ -229,8 +484,8 @@ def compute_benchmark(
     ]
     rows: list[dict[str, Any]] = []
     for label, metric in metrics_to_compare:
-        a_val = _get_value(unified_df, metric, state_a, year_base)
-        b_val = _get_value(unified_df, metric, state_b, year_base)
+        a_val = _get_value(store, metric, state_a, year_base)
+        b_val = _get_value(store, metric, state_b, year_base)
         ratio = safe_ratio(a_val, b_val)
         diff = None
         if a_val is not None and b_val is not None:
@@ -249,12 +504,12 @@ def compute_benchmark(
 
     # Growth proxy: 2024->2026 breweries ratio.
     a_growth = safe_ratio(
-        _get_value(unified_df, METRIC_BREWERIES, state_a, 2026),
-        _get_value(unified_df, METRIC_BREWERIES, state_a, 2024),
+        _get_value(store, METRIC_BREWERIES, state_a, 2026),
+        _get_value(store, METRIC_BREWERIES, state_a, 2024),
     )
     b_growth = safe_ratio(
-        _get_value(unified_df, METRIC_BREWERIES, state_b, 2026),
-        _get_value(unified_df, METRIC_BREWERIES, state_b, 2024),
+        _get_value(store, METRIC_BREWERIES, state_b, 2026),
+        _get_value(store, METRIC_BREWERIES, state_b, 2024),
     )
     rows.append(
         {
@@ -270,6 +525,150 @@ def compute_benchmark(
     return pd.DataFrame(rows)
 
 
+@dataclass(frozen=True)
+class BenchmarkMatrix:
+    """
+    Result of compute_benchmark_matrix: state-level metrics gathered once
+    into values, a (state, metric, year) array (NaN where absent). Pairwise
+    results are (state, state) matrices indexed [a, b], with the semantics
+    of compute_benchmark for the pair (a, b): undefined ratios are NaN.
+    """
+
+    states: tuple[str, ...]
+    metrics: tuple[str, ...]
+    years: tuple[int, ...]
+    values: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def value(self, metric: str, year: int) -> np.ndarray:
+        return self.values[:, self.metrics.index(metric), self.years.index(int(year))]
+
+    def ratio(self, metric: str, year: int) -> np.ndarray:
+        """a / b for every pair."""
+        column = self.value(metric, year)
+        return _pairwise_ratio(column[:, None], column[None, :])
+
+    def difference(self, metric: str, year: int) -> np.ndarray:
+        """a - b for every pair."""
+        column = self.value(metric, year)
+        return column[:, None] - column[None, :]
+
+    def growth(self, metric: str, start_year: int, end_year: int) -> np.ndarray:
+        """end / start per state."""
+        return _pairwise_ratio(self.value(metric, end_year), self.value(metric, start_year))
+
+    def growth_ratio(self, metric: str, start_year: int, end_year: int) -> np.ndarray:
+        """growth(a) / growth(b) for every pair."""
+        growth = self.growth(metric, start_year, end_year)
+        return _pairwise_ratio(growth[:, None], growth[None, :])
+
+    def pairs(self, matrix: np.ndarray, value_name: str = "value") -> pd.DataFrame:
+        """
+        A pairwise matrix as one row per (state_a, state_b), ready for heatmaps.
+        The diagonal is kept; undefined cells are dropped.
+        """
+        frame = pd.DataFrame(
+            {
+                "state_a": np.repeat(self.states, len(self.states)),
+                "state_b": np.tile(self.states, len(self.states)),
+                value_name: matrix.ravel(),
+            }
+        )
+        return frame.dropna(subset=[value_name]).reset_index(drop=True)
+
+    def neighbors(
+        self,
+        year: int,
+        k: int = 5,
+        metrics: Iterable[str] | None = None,
+        state: str | None = None,
+    ) -> pd.DataFrame:
+        """
+        The k states closest to each state (or only to state): Euclidean
+        distance over the metrics' log values in year, each metric scaled to
+        unit standard deviation across states. States missing any of the
+        metrics are left out (an empty frame if state is one of them; a
+        KeyError if it is not in the matrix). Rows: state, rank (1 =
+        closest), neighbor, distance.
+        """
+        if state is not None and state not in self.states:
+            raise KeyError(f"{state!r} is not among the matrix states")
+        metrics = tuple(metrics) if metrics is not None else self.metrics
+        columns = np.column_stack([self.value(metric, year) for metric in metrics])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            features = np.log(columns)
+        usable = np.flatnonzero(np.isfinite(features).all(axis=1))
+        features = features[usable]
+        spread = features.std(axis=0)
+        features = features / np.where(spread > 0, spread, 1)
+
+        distances = np.sqrt(((features[:, None, :] - features[None, :, :]) ** 2).sum(axis=2))
+        np.fill_diagonal(distances, np.inf)
+        sources = np.arange(len(usable))
+        if state is not None:
+            sources = np.flatnonzero(usable == self.states.index(state))
+            if not len(sources):
+                return pd.DataFrame(columns=["state", "rank", "neighbor", "distance"])
+        k = max(0, min(k, len(usable) - 1))
+        nearest = np.argsort(distances[sources], axis=1, kind="stable")[:, :k]
+        states = np.asarray(self.states, dtype=object)
+        return pd.DataFrame(
+            {
+                "state": np.repeat(states[usable[sources]], k),
+                "rank": np.tile(np.arange(1, k + 1), len(sources)),
+                "neighbor": states[usable[nearest]].ravel(),
+                "distance": np.take_along_axis(distances[sources], nearest, axis=1).ravel(),
+            }
+        )
+
+
+def _pairwise_ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    # safe_ratio over arrays: NaN wherever either side is missing or the denominator is 0.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = numerator / denominator
+    return np.where(denominator == 0, np.nan, ratio)
+
+
+BENCHMARK_MATRIX_METRICS = (METRIC_BREWERIES, METRIC_SPENDING)
+
+# Matrices shared by every session of the process; a 27-state one is a few KB.
+_BENCHMARK_MATRIX_CACHE = BoundedLRU(max_entries=64)
+
+
+def compute_benchmark_matrix(
+    store: MetricStore,
+    states: Iterable[str] | None = None,
+    metrics: Iterable[str] = BENCHMARK_MATRIX_METRICS,
+    years: Iterable[int] | None = None,
+) -> BenchmarkMatrix:
+    """
+    All-pairs form of compute_benchmark: one dense gather of every (state,
+    metric, year) value, from which BenchmarkMatrix derives ratio,
+    difference and growth matrices for all state pairs at once. states
+    defaults to state_options(store), years to every year in the store.
+    Memoized process-wide on (store.version, states, metrics, years).
+    """
+    states = tuple(states) if states is not None else tuple(state_options(store))
+    metrics = tuple(metrics)
+    if years is None:
+        year_column = store.df["year"]
+        years = range(int(year_column.min()), int(year_column.max()) + 1) if len(year_column) else ()
+    years = tuple(int(year) for year in years)
+
+    def build() -> BenchmarkMatrix:
+        # Rows come out metric-major: (metric, state) pairs -> (metric, state, year).
+        values, _ = store.matrix([(metric, state) for metric in metrics for state in states], years)
+        values = np.ascontiguousarray(values.reshape(len(metrics), len(states), len(years)).transpose(1, 0, 2))
+        values.setflags(write=False)  # Shared through the cache.
+        return BenchmarkMatrix(states, metrics, years, values)
+
+    if store.version is None:
+        return build()
+    return _BENCHMARK_MATRIX_CACHE.get_or_compute((store.version, states, metrics, years), build)
+
+
 def compute_delta(
     current: float | None,
     previous: float | None,
@@ -320,6 +719,96 @@ def compute_delta(
     }
 
 
+def render_sparkline_svgs(
+    series: np.ndarray,
+    width: int = 60,
+    height: int = 20,
+    colors: Sequence[str] | None = None,
+) -> list[str]:
+    """
+    One SVG sparkline per row of a 2-D array, drawn from the row's non-NaN
+    values in order ("" for rows with fewer than two). Normalization and
+    coordinates are computed for all rows at once; rows with the same
+    number of points share one format template.
+    """
+    values = np.asarray(series, dtype=float)
+    if values.ndim != 2:
+        raise ValueError("series must be a 2-D array (one row per sparkline)")
+    colors = list(colors) if colors is not None else ["#0f766e"] * len(values)
+    svgs = [""] * len(values)
+
+    valid = ~np.isnan(values)
+    counts = valid.sum(axis=1)
+    drawn = np.flatnonzero(counts >= 2)
+    if not len(drawn):
+        return svgs
+    values, valid, counts = values[drawn], valid[drawn], counts[drawn]
+
+    # Same arithmetic as the per-point loop this replaces, so output is identical.
+    low = np.nanmin(values, axis=1, keepdims=True)
+    high = np.nanmax(values, axis=1, keepdims=True)
+    span = np.where(high != low, high - low, 1)
+    # Valid values first, in their original order; NaN padding trails.
+    packed = np.take_along_axis(values, np.argsort(~valid, axis=1, kind="stable"), axis=1)
+    ys = height - ((packed - low) / span) * height
+    xs = np.arange(values.shape[1]) * (width / (counts - 1))[:, None]
+    coords = np.empty((len(values), 2 * values.shape[1]))
+    coords[:, 0::2] = xs
+    coords[:, 1::2] = ys
+
+    head = (
+        f'''<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}"
+        style="display:inline-block; vertical-align:middle; margin-left:8px;">
+        <polyline points="'''
+    ).replace("%", "%%")
+    tail = '''"
+            fill="none" stroke="%s" stroke-width="1.5" />
+    </svg>'''
+    for count in np.unique(counts).tolist():
+        template = head + " ".join(["%.1f,%.1f"] * count) + tail
+        rows = np.flatnonzero(counts == count)
+        for row, point_values in zip(rows.tolist(), coords[rows, : 2 * count].tolist()):
+            svgs[drawn[row]] = template % (*point_values, colors[drawn[row]])
+    return svgs
+
+
+def _sparklines_nbytes(svg: str) -> int:
+    return len(svg) + 64
+
+
+# Rendered sparklines keyed on a digest of the series values and the drawing options.
+_SPARKLINE_CACHE = BoundedLRU(max_entries=65_536, max_bytes=32 * 1024 * 1024, sizeof=_sparklines_nbytes)
+
+
+def generate_sparkline_svgs(
+    series: np.ndarray | Sequence[Sequence[float]],
+    width: int = 60,
+    height: int = 20,
+    color: str | Sequence[str] = "#0f766e",
+) -> list[str]:
+    """
+    Batched, memoized render_sparkline_svgs: rows already drawn with the
+    same values, size and color (in any earlier call, from any session)
+    come from the cache; the rest are rendered together in one pass.
+    color is one color for every row or one per row.
+    """
+    values = np.ascontiguousarray(series, dtype=float)
+    if values.ndim == 1:
+        values = values.reshape(1, -1)
+    colors = [color] * len(values) if isinstance(color, str) else list(color)
+    keys = [
+        (hashlib.blake2b(row.tobytes(), digest_size=16).digest(), width, height, row_color)
+        for row, row_color in zip(values, colors)
+    ]
+    svgs = [_SPARKLINE_CACHE.get(key) for key in keys]
+    missing = [index for index, svg in enumerate(svgs) if svg is None]
+    if missing:
+        rendered = render_sparkline_svgs(values[missing], width, height, [colors[index] for index in missing])
+        for index, svg in zip(missing, rendered):
+            svgs[index] = _SPARKLINE_CACHE.put(keys[index], svg)
+    return svgs
+
+
 def generate_sparkline_svg(
     values: list[float],
     width: int = 60,
@@ -332,35 +821,129 @@ def generate_sparkline_svg(
     """
     if not values or len(values) < 2:
         return ""
+    return generate_sparkline_svgs([values], width, height, color)[0]
 
-    # Normalize values to 0-1 range
-    min_val = min(values)
-    max_val = max(values)
-    range_val = max_val - min_val if max_val != min_val else 1
 
-    normalized = [(v - min_val) / range_val for v in values]
+@dataclass(frozen=True)
+class KpiSpec:
+    """
+    One KPI card: a (metric, segment) pair and how to display it.
+    """
 
-    # Create points for polyline (invert Y because SVG coordinates start at top)
-    points = []
-    step_x = width / (len(values) - 1)
-    for i, val in enumerate(normalized):
-        x = i * step_x
-        y = height - (val * height)  # Invert Y
-        points.append(f"{x:.1f},{y:.1f}")
+    metric: str
+    label: str
+    unit: str = ""
+    decimals: int = 2
+    include_sparkline: bool = True
+    segment: str = "Brasil"
 
-    polyline = " ".join(points)
 
-    svg = f'''<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}"
-        style="display:inline-block; vertical-align:middle; margin-left:8px;">
-        <polyline points="{polyline}"
-            fill="none" stroke="{color}" stroke-width="1.5" />
-    </svg>'''
+_SPARKLINE_FIRST_YEAR = 2021
+_SPARKLINE_YEARS = 5
+# Delta codes: 0 stable, 1 up, 2 down.
+_DELTA_STYLES = (("→", "#64748b"), ("↗", "#0f766e"), ("↘", "#dc2626"))
+
+
+def _kpis_nbytes(kpis: list[dict[str, Any]]) -> int:
+    # Sparklines dominate; the rest of a card is a few hundred bytes.
+    return sum(len(kpi["sparkline_svg"]) + 512 for kpi in kpis)
 
-    return svg
+
+# Finished KPI cards shared by every session of the process.
+_KPI_CACHE = BoundedLRU(max_entries=1024, max_bytes=8 * 1024 * 1024, sizeof=_kpis_nbytes)
+
+
+def _compute_kpi_cards(store: MetricStore, specs: tuple[KpiSpec, ...], year: int) -> list[dict[str, Any]]:
+    window_start = max(_SPARKLINE_FIRST_YEAR, year - _SPARKLINE_YEARS + 1)
+    axis_start = min(window_start, year - 1)
+    values, statuses = store.matrix(
+        [(spec.metric, spec.segment) for spec in specs], range(axis_start, year + 1)
+    )
+    current = values[:, -1]
+    previous = values[:, -2]
+    history = values[:, window_start - axis_start:]
+
+    valid_delta = ~np.isnan(current) & ~np.isnan(previous) & (previous != 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct_change = ((current - previous) / previous) * 100
+    delta_code = valid_delta * ((pct_change > 0.5) + 2 * (pct_change < -0.5))
+    with_sparkline = (
+        np.array([spec.include_sparkline for spec in specs])
+        & ~np.isnan(current)
+        & ((~np.isnan(history)).sum(axis=1) >= 2)
+    )
+
+    # Every card's sparkline in one batched render; rows without one are all-NaN.
+    sparklines = generate_sparkline_svgs(
+        np.where(with_sparkline[:, None], history, np.nan),
+        color=["#0f766e" if code == 1 else "#3b82f6" for code in delta_code.tolist()],
+    )
+
+    # Formatting is inherently per card; do it over plain lists, not numpy scalars.
+    current_vals = np.where(np.isnan(current), None, current).tolist()
+    previous_vals = np.where(np.isnan(previous), None, previous).tolist()
+    cards = []
+    for spec, current_val, previous_val, valid, pct, code, sparkline_svg, status in zip(
+        specs,
+        current_vals,
+        previous_vals,
+        valid_delta.tolist(),
+        pct_change.tolist(),
+        delta_code.tolist(),
+        sparklines,
+        statuses[:, -1].tolist(),
+    ):
+        arrow, color = _DELTA_STYLES[code]
+        formatted_delta = f"{'+' if pct > 0 else ''}{pct:.1f}%" if valid else "n/d"
+        delta = {
+            "pct_change": pct if valid else None,
+            "arrow": arrow,
+            "color": color,
+            "formatted": formatted_delta,
+        }
+
+        cards.append(
+            {
+                "label": spec.label,
+                "current_value": current_val,
+                "previous_value": previous_val,
+                "formatted_value": "n/d" if current_val is None else f"{current_val:.{spec.decimals}f}{spec.unit}",
+                "delta": delta,
+                "sparkline_svg": sparkline_svg,
+                "status": status or "unknown",
+            }
+        )
+    return cards
+
+
+def compute_kpis(
+    store: MetricStore,
+    specs: Iterable[KpiSpec],
+    year: int,
+) -> list[dict[str, Any]]:
+    """
+    KPI cards for any number of specs from one dense (spec x year) gather:
+    deltas, status flags and sparkline series come from array operations on
+    that matrix, not per-KPI lookups.
+
+    Each card has label, current_value, previous_value, formatted_value,
+    delta (as compute_delta), sparkline_svg and status. Memoized process-wide
+    on (store.version, year, specs); every call returns its own copy.
+    """
+    specs = tuple(specs)
+    year = int(year)
+    if not specs:
+        return []
+    if store.version is None:
+        return _compute_kpi_cards(store, specs, year)
+    cards = _KPI_CACHE.get_or_compute(
+        (store.version, year, specs), lambda: _compute_kpi_cards(store, specs, year)
+    )
+    return [{**card, "delta": dict(card["delta"])} for card in cards]
 
 
 def compute_kpi_with_delta(
-    df: pd.DataFrame,
+    store: MetricStore,
     metric: str,
     segment: str,
     current_year: int,
@@ -371,96 +954,28 @@ def compute_kpi_with_delta(
 ) -> dict[str, Any]:
     """
     Computes a KPI with delta comparison to previous year and optional sparkline.
-
-    Returns dict with:
-    - label: display label
-    - current_value: current year value
-    - previous_value: previous year value
-    - formatted_value: formatted string with unit
-    - delta: dict from compute_delta()
-    - sparkline_svg: SVG string (if include_sparkline=True)
-    - status: data status (official/estimated)
+    Single-card form of compute_kpis.
     """
-    current_val = _get_value(df, metric, segment, current_year)
-    previous_val = _get_value(df, metric, segment, current_year - 1)
-
-    # Get data status
-    status_row = df[
-        (df["metric"] == metric)
-        & (df["segment"] == segment)
-        & (df["year"] == current_year)
-    ]
-    status = status_row.iloc[0]["data_status"] if not status_row.empty else "unknown"
+    spec = KpiSpec(metric, label, unit, decimals, include_sparkline, segment)
+    return compute_kpis(store, [spec], current_year)[0]
 
-    # Format current value
-    if current_val is None or pd.isna(current_val):
-        formatted_value = "n/d"
-    else:
-        formatted_value = f"{current_val:.{decimals}f}{unit}"
-
-    # Compute delta
-    delta = compute_delta(current_val, previous_val)
-
-    # Generate sparkline (last 4-5 years)
-    sparkline_svg = ""
-    if include_sparkline and current_val is not None:
-        years = range(max(2021, current_year - 4), current_year + 1)
-        values = []
-        for year in years:
-            val = _get_value(df, metric, segment, year)
-            if val is not None:
-                values.append(val)
-
-        if len(values) >= 2:
-            sparkline_svg = generate_sparkline_svg(
-                values,
-                color="#0f766e" if delta["arrow"] == "↗" else "#3b82f6"
-            )
 
-    return {
-        "label": label,
-        "current_value": current_val,
-        "previous_value": previous_val,
-        "formatted_value": formatted_value,
-        "delta": delta,
-        "sparkline_svg": sparkline_svg,
-        "status": status,
-    }
+MAIN_KPIS = (
+    KpiSpec(METRIC_ZERO_VOL, "Volume Cerveja Zero", " bi L", decimals=3),
+    KpiSpec(METRIC_ZERO_SHARE, "Market Share Zero", "%", decimals=1),
+    KpiSpec(METRIC_BREWERIES, "Cervejarias no Brasil", "", decimals=0),
+    KpiSpec(METRIC_PER_CAPITA, "Consumo Per Capita", " L/hab", decimals=1),
+    KpiSpec(METRIC_TRADE_EXPORT_VOL, "Exportações", " M L", decimals=0),
+    KpiSpec(METRIC_GLOBAL_RANK_ZERO, "Ranking Global Zero", "º", decimals=0, include_sparkline=False),
+)
 
 
 def compute_main_kpis(
-    df: pd.DataFrame,
+    store: MetricStore,
     year: int,
+    kpis: Iterable[KpiSpec] = MAIN_KPIS,
 ) -> list[dict[str, Any]]:
     """
     Computes the 6 main KPIs for the dashboard overview page.
     """
-    kpis = [
-        compute_kpi_with_delta(
-            df, METRIC_ZERO_VOL, "Brasil", year,
-            "Volume Cerveja Zero", " bi L", decimals=3
-        ),
-        compute_kpi_with_delta(
-            df, METRIC_ZERO_SHARE, "Brasil", year,
-            "Market Share Zero", "%", decimals=1
-        ),
-        compute_kpi_with_delta(
-            df, METRIC_BREWERIES, "Brasil", year,
-            "Cervejarias no Brasil", "", decimals=0
-        ),
-        compute_kpi_with_delta(
-            df, METRIC_PER_CAPITA, "Brasil", year,
-            "Consumo Per Capita", " L/hab", decimals=1
-        ),
-        compute_kpi_with_delta(
-            df, METRIC_TRADE_EXPORT_VOL, "Brasil", year,
-            "Exportações", " M L", decimals=0
-        ),
-        compute_kpi_with_delta(
-            df, METRIC_GLOBAL_RANK_ZERO, "Brasil", year,
-            "Ranking Global Zero", "º", decimals=0,
-            include_sparkline=False
-        ),
-    ]
-
-    return kpis
+    return compute_kpis(store, kpis, year)
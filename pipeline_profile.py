@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+import json
+import math
+import os
+from pathlib import Path
+import time
+import tracemalloc
+from typing import Any, Iterator
+
+
+# tracemalloc slows the pipeline down severalfold, so memory is opt-in.
+PROFILE_MEMORY = os.environ.get("CERVEJA_PROFILE_MEMORY", "") not in ("", "0")
+
+
+@dataclass
+class StageRecord:
+    name: str
+    wall_s: float = 0.0
+    rows_in: int | None = None
+    rows_out: int | None = None
+    peak_mem_kb: float | None = None
+
+
+@dataclass
+class FetchRecord:
+    source_id: str
+    url: str
+    outcome: str
+    latency_s: float | None = None
+    http_status: int | None = None
+
+
+def _optional_number(value: Any) -> float | None:
+    # Fetch rows come from a DataFrame, where missing values are NaN.
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return float(value)
+
+
+@dataclass
+class PipelineProfile:
+    """
+    Per-stage wall time, row counts and (with trace_memory) peak traced
+    allocation of one build_data_bundle run, plus per-URL fetch results.
+    """
+
+    trace_memory: bool = PROFILE_MEMORY
+    started_utc: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    total_s: float = 0.0
+    stages: list[StageRecord] = field(default_factory=list)
+    fetches: list[FetchRecord] = field(default_factory=list)
+
+    @contextmanager
+    def stage(self, name: str, rows_in: int | None = None) -> Iterator[StageRecord]:
+        """
+        Times the block; set rows_out on the yielded record before it exits.
+        Stages must not nest when trace_memory is on (peaks are reset per stage).
+        """
+        record = StageRecord(name=name, rows_in=rows_in)
+        own_trace = self.trace_memory and not tracemalloc.is_tracing()
+        if own_trace:
+            tracemalloc.start()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.wall_s = round(time.perf_counter() - started, 6)
+            if self.trace_memory:
+                record.peak_mem_kb = round((tracemalloc.get_traced_memory()[1] - baseline) / 1024, 1)
+            if own_trace:
+                tracemalloc.stop()
+            self.stages.append(record)
+
+    def record_fetches(self, sources: list[dict[str, Any]]) -> None:
+        for source in sources:
+            latency_s = _optional_number(source.get("latency_s"))
+            http_status = _optional_number(source.get("http_status"))
+            self.fetches.append(
+                FetchRecord(
+                    source_id=source["source_id"],
+                    url=source["url"],
+                    outcome=source["outcome"],
+                    latency_s=None if latency_s is None else round(latency_s, 6),
+                    http_status=None if http_status is None else int(http_status),
+                )
+            )
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> PipelineProfile:
+        return cls(
+            trace_memory=payload.get("trace_memory", False),
+            started_utc=payload.get("started_utc", ""),
+            total_s=payload.get("total_s", 0.0),
+            stages=[StageRecord(**stage) for stage in payload.get("stages", [])],
+            fetches=[FetchRecord(**fetch) for fetch in payload.get("fetches", [])],
+        )
+
+    def to_json(self, indent: int | None = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
+
+    def dump(self, path: Path | str) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.to_json(), encoding="utf-8")
+        return path
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import streamlit as st
+
+from dashboard_queries import DashboardQueries
+from memo import BoundedLRU
+from metrics import MetricStore
+from ui_sections import section_visible
+
+
+@dataclass(frozen=True)
+class SectionContext:
+    """
+    What section loaders may depend on: the bundle's query layer and metric
+    store, plus the page's year and status filters.
+    """
+
+    queries: DashboardQueries
+    store: MetricStore
+    year: int
+    statuses: tuple[str, ...]
+
+    @property
+    def key(self) -> tuple[Any, ...]:
+        return (self.queries.version, tuple(sorted(self.statuses)), self.year)
+
+
+SectionLoader = Callable[[SectionContext], Any]
+SectionRenderer = Callable[[SectionContext, dict[str, Any]], None]
+
+
+@dataclass(frozen=True)
+class Section:
+    section_id: str
+    step: int
+    loaders: dict[str, SectionLoader]
+    render: SectionRenderer
+    fragment: bool = False
+    story_only: bool = False
+
+
+SECTIONS: dict[str, Section] = {}
+
+
+def section(
+    section_id: str,
+    step: int,
+    fragment: bool = False,
+    story_only: bool = False,
+    **loaders: SectionLoader,
+) -> Callable[[SectionRenderer], SectionRenderer]:
+    """
+    Registers a page section for a story step. Each keyword names a piece of
+    data the section needs and the function that computes it from the
+    SectionContext; the renderer receives them as a dict. Sections render in
+    registration order. A fragment section runs as an st.fragment: its own
+    widgets rerun only that section, not the page. A story_only section is
+    left off the default page and shown only in presentation mode.
+    """
+
+    def register(render: SectionRenderer) -> SectionRenderer:
+        SECTIONS[section_id] = Section(section_id, step, dict(loaders), render, fragment, story_only)
+        return render
+
+    return register
+
+
+# Loader results per (bundle version, statuses, year); shared across reruns and sessions.
+_SECTION_DATA = BoundedLRU(max_entries=512)
+
+
+def section_data(entry: Section, ctx: SectionContext) -> dict[str, Any]:
+    """Runs the section's loaders on first use for this context; cached after that. Treat as read-only."""
+    return {
+        name: _SECTION_DATA.get_or_compute((ctx.key, entry.section_id, name), lambda loader=loader: loader(ctx))
+        for name, loader in entry.loaders.items()
+    }
+
+
+def render_sections(ctx: SectionContext, story_mode: bool, current_step: int) -> list[str]:
+    """
+    Renders the sections visible at current_step (outside story mode, all
+    but the story_only ones), each followed by a divider. Hidden sections run neither loaders
+    nor renderers. Returns the ids rendered.
+    """
+    rendered = []
+    for entry in SECTIONS.values():
+        if entry.story_only and not story_mode:
+            continue
+        if not section_visible(story_mode, current_step, entry.step):
+            continue
+        # Fragment ids derive from the function's qualified name, which is unique per section.
+        render = st.fragment(entry.render) if entry.fragment else entry.render
+        render(ctx, section_data(entry, ctx))
+        st.markdown("---")
+        rendered.append(entry.section_id)
+    return rendered
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import dataclasses
+from datetime import datetime, timezone
+import logging
+import os
+from pathlib import Path
+import random
+import tempfile
+import threading
+import time
+from typing import Any, Callable
+
+from bundle_snapshot import read_snapshot, write_snapshot
+
+
+logger = logging.getLogger(__name__)
+
+
+_TMPFS = Path("/dev/shm")
+SHARED_DIR = Path(
+    os.environ.get(
+        "CERVEJA_SHARED_DIR",
+        (_TMPFS if _TMPFS.is_dir() else Path(tempfile.gettempdir())) / "cerveja-zero",
+    )
+)
+SHARING_SCOPES = ("process", "host")
+BUNDLE_SHARING = os.environ.get("CERVEJA_BUNDLE_SHARING", "process")
+
+
+class SharedBundle:
+    """
+    The current data bundle, published once and attached to by every session.
+
+    scope="process" keeps one copy per worker process. scope="host" publishes
+    it as an Arrow IPC file in a tmpfs directory that every worker
+    memory-maps: numeric columns and categorical codes are views of that
+    mapping, so they exist once per host, while each process builds its own
+    category dictionaries (the small vocabularies of the text columns; see
+    read_snapshot). Publishing swaps
+    the bundle atomically (os.replace of the file, a reference swap in
+    process); sessions still holding the previous frame keep it valid.
+    """
+
+    def __init__(self, scope: str = "process", directory: Path | str = SHARED_DIR) -> None:
+        if scope not in SHARING_SCOPES:
+            raise ValueError(f"scope must be one of {SHARING_SCOPES}, got {scope!r}")
+        self.scope = scope
+        self.path = Path(directory) / "bundle.arrow"
+        self._bundle: dict[str, Any] | None = None
+        self._published_at = 0.0
+        self._file_key: tuple[int, int] | None = None
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def current(self) -> dict[str, Any] | None:
+        """
+        The latest published bundle; in host scope, re-attaches when another
+        process has published since the last call (one stat per call).
+        """
+        if self.scope == "host":
+            try:
+                stat = self.path.stat()
+            except OSError:
+                return self._bundle
+            key = (stat.st_ino, stat.st_mtime_ns)
+            with self._lock:
+                if key != self._file_key:
+                    attached = read_snapshot(self.path)
+                    if attached is not None:
+                        self._bundle = attached
+                        self._file_key = key
+                        self._published_at = stat.st_mtime
+        return self._bundle
+
+    def age_s(self) -> float | None:
+        if self.current() is None:
+            return None
+        return time.time() - self._published_at
+
+    def publish(self, bundle: dict[str, Any]) -> dict[str, Any]:
+        if self.scope == "host":
+            try:
+                write_snapshot(bundle, self.path, bundle["version"])
+            except OSError:
+                pass  # Keep serving a private copy rather than failing the page.
+            else:
+                attached = self.current()
+                if attached is not None:
+                    return attached
+        with self._lock:
+            self._bundle = bundle
+            self._published_at = time.time()
+            self._file_key = None
+        return bundle
+
+    def get_or_publish(
+        self,
+        build: Callable[[], dict[str, Any]],
+        max_age_s: float | None = None,
+    ) -> dict[str, Any]:
+        """
+        Returns the shared bundle, building and publishing it first when there
+        is none yet or it is older than max_age_s. Concurrent callers in one
+        process wait for a single build.
+        """
+        bundle = self.current()
+        if bundle is not None and not self._expired(max_age_s):
+            return bundle
+        with self._build_lock:
+            bundle = self.current()
+            if bundle is None or self._expired(max_age_s):
+                bundle = self.publish(build())
+        return bundle
+
+    def replace_meta(self, runtime_meta: Any) -> None:
+        """
+        Swaps in new RuntimeMeta for the current bundle in this process only
+        (the data, and any host-wide file, are untouched).
+        """
+        with self._lock:
+            if self._bundle is not None:
+                self._bundle = {**self._bundle, "runtime_meta": runtime_meta}
+
+    def _expired(self, max_age_s: float | None) -> bool:
+        return max_age_s is not None and time.time() - self._published_at > max_age_s
+
+
+class BundleRefresher:
+    """
+    Daemon thread that rebuilds the bundle off the request path and publishes
+    it through a SharedBundle; readers keep the previous bundle until the swap.
+
+    Refreshes run every interval_s, shifted by up to +-jitter_s so workers
+    sharing a host do not refresh in lockstep. A bundle that is not "online"
+    (e.g. built offline at startup) is due right away; one refreshed less than
+    half an interval ago (by another worker) is left alone. A failed build
+    keeps the previous bundle, records the failure in its RuntimeMeta and is
+    retried after retry_s.
+    """
+
+    def __init__(
+        self,
+        shared: SharedBundle,
+        build: Callable[[], dict[str, Any]],
+        interval_s: float = 86400,
+        jitter_s: float = 3600,
+        retry_s: float = 900,
+    ) -> None:
+        self.shared = shared
+        self.build = build
+        self.interval_s = interval_s
+        self.jitter_s = jitter_s
+        self.retry_s = retry_s
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> BundleRefresher:
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="bundle-refresher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def refresh(self) -> bool:
+        """
+        One rebuild-and-publish, run in the calling thread. Returns False (and
+        keeps the previous bundle) when the build raises.
+        """
+        started = time.perf_counter()
+        try:
+            bundle = self.build()
+        except Exception:
+            logger.exception("Bundle refresh failed; keeping the previous bundle")
+            current = self.shared.current()
+            if current is not None:
+                self.shared.replace_meta(
+                    dataclasses.replace(
+                        current["runtime_meta"],
+                        refresh_duration_s=round(time.perf_counter() - started, 3),
+                        refresh_outcome="failed",
+                        last_attempt_utc=datetime.now(timezone.utc).isoformat(),
+                    )
+                )
+            return False
+        self.shared.publish(bundle)
+        return True
+
+    def _due_in(self) -> float:
+        bundle = self.shared.current()
+        if bundle is None or bundle["runtime_meta"].status != "online":
+            return 0.0
+        try:
+            refreshed = datetime.fromisoformat(bundle["runtime_meta"].last_refresh_utc)
+        except ValueError:
+            return 0.0
+        age = (datetime.now(timezone.utc) - refreshed).total_seconds()
+        return max(0.0, self.interval_s - age)
+
+    def _run(self) -> None:
+        delay = self._due_in() + random.uniform(0, self.jitter_s)
+        while not self._stop.wait(delay):
+            if self._due_in() > self.interval_s / 2:
+                ok = True
+            else:
+                ok = self.refresh()
+            base = self.interval_s if ok else self.retry_s
+            delay = max(0.0, base + random.uniform(-self.jitter_s, self.jitter_s))
+
+
+SHARED_BUNDLE = SharedBundle(BUNDLE_SHARING)
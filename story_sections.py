@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pandas as pd
+import streamlit as st
+
+from chart_cache import render_chart
+from data_pipeline import METRIC_BREWERIES, METRIC_REGULAR_VOL, METRIC_SPENDING, METRIC_ZERO_VOL
+from memo import BoundedLRU
+from metrics import (
+    SCENARIO_VOLUME_METRICS,
+    compute_benchmark,
+    compute_benchmark_matrix,
+    compute_insights,
+    simulate_scenarios,
+    state_options,
+)
+from section_registry import SectionContext, section
+from ui_sections import render_insight_cards
+
+
+# Presentation-mode sections (story steps 4 and 5). They are story_only, so
+# the default page neither renders them nor runs their loaders. Imported
+# after home_sections: registration order is page order.
+
+
+def _benchmark_states(ctx: SectionContext) -> list[str]:
+    return [state for state in state_options(ctx.store) if state != "Outros"]
+
+
+# Metrics offered in the all-pairs comparison heatmap.
+_MATRIX_METRICS = {"Cervejarias": METRIC_BREWERIES, "Gasto (R$ bi)": METRIC_SPENDING}
+
+
+_SCENARIO_CHART_METRICS = (METRIC_ZERO_VOL, METRIC_REGULAR_VOL)
+
+# Chart data per (context, slider values): moving a slider back is a lookup.
+_SCENARIO_VOLUMES = BoundedLRU(max_entries=256)
+
+
+def _volume_history(ctx: SectionContext) -> pd.DataFrame:
+    df = ctx.store.df
+    history = df[df["segment"].eq("Brasil") & df["metric"].isin(_SCENARIO_CHART_METRICS)]
+    return history[["year", "metric", "value"]].astype({"metric": str})
+
+
+def _scenario_volumes(
+    ctx: SectionContext,
+    history: pd.DataFrame,
+    growth_zero: float,
+    regular_variation: float,
+    elasticity: float,
+) -> pd.DataFrame:
+    """
+    Brazil's zero and regular volumes under the scenario: what apply_scenario
+    writes for those series, read from the ScenarioGrid instead of a copy
+    of the whole table.
+    """
+
+    def build() -> pd.DataFrame:
+        grid = simulate_scenarios(ctx.store, growth_zero, regular_variation, elasticity)
+        volumes = {METRIC_ZERO_VOL: grid.zero, METRIC_REGULAR_VOL: grid.regular}
+        simulated = pd.DataFrame(
+            [
+                {"year": year, "metric": metric, "value": float(volumes[metric][0, index])}
+                for metric in _SCENARIO_CHART_METRICS
+                for index, year in enumerate(grid.years)
+                if grid.volume_written[SCENARIO_VOLUME_METRICS.index(metric), index]
+            ],
+            columns=["year", "metric", "value"],
+        )
+        replaced = history.set_index(["metric", "year"]).index.isin(simulated.set_index(["metric", "year"]).index)
+        return pd.concat([history[~replaced], simulated], ignore_index=True).sort_values(
+            ["metric", "year"], ignore_index=True
+        )
+
+    return _SCENARIO_VOLUMES.get_or_compute((ctx.key, growth_zero, regular_variation, elasticity), build)
+
+
+@section(
+    "scenarios",
+    step=4,
+    fragment=True,
+    story_only=True,
+    history=_volume_history,
+    states=_benchmark_states,
+    benchmark=lambda ctx: compute_benchmark_matrix(ctx.store, _benchmark_states(ctx), _MATRIX_METRICS.values()),
+)
+def scenarios_section(ctx: SectionContext, data: dict[str, Any]) -> None:
+    st.markdown('<div class="section-title">🔮 Cenários 2025-2026</div>', unsafe_allow_html=True)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        growth_zero = st.slider("Crescimento cerveja zero (%)", -20, 120, 20, key="scenario_growth_zero")
+    with col2:
+        regular_variation = st.slider("Variação cerveja tradicional (%)", -20, 20, 0, key="scenario_regular")
+    with col3:
+        elasticity = st.slider("Elasticidade gasto (%)", -15, 15, 0, key="scenario_elasticity")
+
+    volumes = _scenario_volumes(ctx, data["history"], growth_zero, regular_variation, elasticity)
+    render_chart("zero_vs_regular_lines", volumes, height=320)
+
+    st.markdown("**⚖️ Comparação entre Estados**")
+    states = data["states"]
+    if len(states) >= 2:
+        col1, col2 = st.columns(2)
+        with col1:
+            state_a = st.selectbox(
+                "Estado A", states, index=states.index("São Paulo") if "São Paulo" in states else 0,
+                key="benchmark_state_a",
+            )
+        with col2:
+            state_b = st.selectbox(
+                "Estado B", states, index=states.index("Minas Gerais") if "Minas Gerais" in states else 1,
+                key="benchmark_state_b",
+            )
+        st.dataframe(
+            compute_benchmark(ctx.store, state_a, state_b, ctx.year),
+            hide_index=True,
+            use_container_width=True,
+        )
+
+        st.markdown("**🧮 Todos os Estados, par a par**")
+        matrix = data["benchmark"]
+        metric_label = st.radio(
+            "Métrica", list(_MATRIX_METRICS), horizontal=True, key="benchmark_matrix_metric"
+        )
+        pairs = matrix.pairs(matrix.ratio(_MATRIX_METRICS[metric_label], ctx.year), "ratio")
+        if not pairs.empty:
+            st.caption("Cada célula mostra Estado A / Estado B.")
+            render_chart("state_ratio_heatmap", pairs, height=max(240, 24 * len(matrix)))
+
+        neighbors = matrix.neighbors(ctx.year, k=3, state=state_a)
+        if not neighbors.empty:
+            st.caption(f"Estados mais parecidos com {state_a} (cervejarias e gasto): {', '.join(neighbors['neighbor'])}")
+
+
+@section("insights", step=5, story_only=True, insights=lambda ctx: compute_insights(ctx.store, ctx.year, None))
+def insights_section(ctx: SectionContext, data: dict[str, Any]) -> None:
+    st.markdown('<div class="section-title">✅ Recomendações</div>', unsafe_allow_html=True)
+
+    render_insight_cards(data["insights"])
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from bundle_snapshot import read_snapshot, write_snapshot
+from data_pipeline import METRIC_BREWERIES, UNIFIED_COLUMNS, RuntimeMeta, compact_unified
+
+
+def test_snapshot_columns_are_views_of_the_mapping(tmp_path: Path) -> None:
+    unified = compact_unified(
+        pd.DataFrame(
+            {
+                "year": [2023, 2024],
+                "metric": METRIC_BREWERIES,
+                "segment": "Brasil",
+                "segment_type": "country",
+                "value": [1847.0, 1949.0],
+                "data_status": "official",
+                "source": "MAPA",
+            },
+            columns=UNIFIED_COLUMNS,
+        )
+    )
+    bundle = {
+        "unified": unified,
+        "runtime_meta": RuntimeMeta(
+            status="ok", last_refresh_utc="", source_count=0, notes=""
+        ),
+        "runtime_sources": {},
+        "version": "test",
+    }
+    path = write_snapshot(bundle, tmp_path / "bundle.arrow", "fp")
+
+    loaded = read_snapshot(path, "fp")["unified"]
+
+    pd.testing.assert_frame_equal(loaded, unified)
+    # Zero-copy arrays from the mapping are read-only; anything copied is not.
+    assert not loaded["year"].to_numpy().flags.writeable
+    assert not loaded["value"].to_numpy().flags.writeable
+    for column in ("metric", "segment", "source"):
+        assert not np.asarray(loaded[column].cat.codes).flags.writeable
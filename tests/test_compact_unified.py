@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from data_pipeline import METRIC_BREWERIES, UNIFIED_COLUMNS, compact_unified
+
+
+def _unified(values: list[float]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "year": range(2020, 2020 + len(values)),
+            "metric": METRIC_BREWERIES,
+            "segment": "Brasil",
+            "segment_type": "country",
+            "value": values,
+            "data_status": "official",
+            "source": "MAPA",
+        },
+        columns=UNIFIED_COLUMNS,
+    )
+
+
+def test_values_that_round_trip_exactly_are_downcast() -> None:
+    compact = compact_unified(_unified([1949.0, 0.5, np.nan]))
+
+    assert compact["value"].dtype == np.float32
+    assert compact["value"].astype(float).tolist()[:2] == [1949.0, 0.5]
+
+
+def test_inexact_values_stay_float64() -> None:
+    compact = compact_unified(_unified([1949.0, 72.84]))
+
+    assert compact["value"].dtype == np.float64
+    assert compact["value"].tolist() == [1949.0, 72.84]
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from data_pipeline import RUNTIME_SOURCES, _parse_runtime_page
+
+
+# Layout of the gov.br news page, trimmed: the previous year's total comes
+# before the national count, followed by per-state and regional counts.
+MAPA_2024_PAGE = (Path(__file__).parent / "fixtures" / "mapa_2024.html").read_text(encoding="utf-8")
+
+
+def _chunks(text: str, size: int) -> list[str]:
+    return [text[start:start + size] for start in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("chunk_chars", [64, 1024, len(MAPA_2024_PAGE)])
+def test_national_total_is_the_largest_candidate(chunk_chars: int) -> None:
+    url = RUNTIME_SOURCES["mapa_2024"]
+    row, _ = _parse_runtime_page("mapa_2024", url, _chunks(MAPA_2024_PAGE, chunk_chars))
+
+    # 1.847 (2023) is the first count above 1,000; 12000 sits in an inline script.
+    assert row is not None
+    assert row["year"] == 2024
+    assert row["value"] == 1949.0
+    assert row["source"] == url
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+from typing import Iterator
+
+import pandas as pd
+import pytest
+
+import data_pipeline
+from data_pipeline import METRIC_BREWERIES, fetch_runtime_updates
+
+
+DEADLINE_S = 1.0
+# The slow page keeps sending bytes, so only the global deadline (not the
+# per-read socket timeout) can stop it.
+SLOW_PAGE_S = 4.0
+FAST_PAGE = "<html><body><p>O Brasil chegou a 1.949 cervejarias registradas.</p></body></html>".encode()
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        self.server.client_ports.append(self.client_address[1])
+        if self.path == "/fast":
+            self._send_headers(200, len(FAST_PAGE))
+            self.wfile.write(FAST_PAGE)
+        elif self.path == "/slow":
+            pieces = int(SLOW_PAGE_S / 0.1)
+            filler = b"<p>" + b"." * 61 + b"</p>"
+            self._send_headers(200, pieces * len(filler))
+            try:
+                for _ in range(pieces):
+                    self.wfile.write(filler)
+                    self.wfile.flush()
+                    time.sleep(0.1)
+            except OSError:
+                pass  # The client gave up, as it should.
+        elif self.path == "/error":
+            body = b"erro interno"
+            self._send_headers(500, len(body))
+            self.wfile.write(body)
+        else:
+            self._send_headers(404, 0)
+
+    def _send_headers(self, status: int, length: int) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(length))
+        self.end_headers()
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def stand_in() -> Iterator[ThreadingHTTPServer]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    server.daemon_threads = True
+    server.block_on_close = False
+    server.client_ports = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def fresh_session(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Each test gets its own pooled session, not one left over from another test.
+    monkeypatch.setattr(data_pipeline, "_RUNTIME_SESSION", None)
+
+
+def _base_url(server: ThreadingHTTPServer) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def _sources(base_url: str) -> dict[str, str]:
+    # The ids carry the year the default extraction rule assigns to the count.
+    return {
+        "fast_2024": f"{base_url}/fast",
+        "slow_2023": f"{base_url}/slow",
+        "error_2022": f"{base_url}/error",
+    }
+
+
+def test_global_deadline_returns_partial_results(stand_in: ThreadingHTTPServer) -> None:
+    base_url = _base_url(stand_in)
+    started = time.perf_counter()
+    updates = fetch_runtime_updates(timeout_s=DEADLINE_S, sources=_sources(base_url), cache_dir=None)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < DEADLINE_S + 0.5
+
+    unified = updates["unified"]
+    assert unified.to_dict("records") == [
+        {
+            "year": 2024,
+            "metric": METRIC_BREWERIES,
+            "segment": "Brasil",
+            "segment_type": "country",
+            "value": 1949.0,
+            "data_status": "official",
+            "source": f"{base_url}/fast",
+        }
+    ]
+
+    outcomes = updates["sources"].set_index("source_id")
+    assert outcomes.loc["fast_2024", "outcome"] == "fresh"
+    assert outcomes.loc["fast_2024", "http_status"] == 200
+    assert outcomes.loc["error_2022", "outcome"] == "unavailable"
+    assert outcomes.loc["error_2022", "http_status"] == 500
+    # Still running at the deadline: no row, no status, no latency.
+    assert outcomes.loc["slow_2023", "outcome"] == "unavailable"
+    assert pd.isna(outcomes.loc["slow_2023", "latency_s"])
+    assert pd.isna(outcomes.loc["slow_2023", "http_status"])
+
+
+def test_slow_source_does_not_block_the_batch(stand_in: ThreadingHTTPServer) -> None:
+    started = time.perf_counter()
+    results = data_pipeline._fetch_all_runtime_sources(_sources(_base_url(stand_in)), DEADLINE_S, None, None)
+
+    assert time.perf_counter() - started < DEADLINE_S + 0.5
+    assert set(results) == {"fast_2024", "error_2022"}
+    assert results["fast_2024"][1] == "fresh"
+    assert results["error_2022"][1:2] == ("unavailable",)
+
+
+def test_session_is_pooled_across_batches(stand_in: ThreadingHTTPServer) -> None:
+    sources = {"fast_2024": f"{_base_url(stand_in)}/fast"}
+    for _ in range(3):
+        updates = fetch_runtime_updates(timeout_s=DEADLINE_S, sources=sources, cache_dir=None)
+        assert updates["unified"]["value"].tolist() == [1949.0]
+
+    # Every request after the first rode the same keep-alive connection.
+    assert len(stand_in.client_ports) == 3
+    assert len(set(stand_in.client_ports)) == 1
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from functools import lru_cache
+import hashlib
+import logging
+from pathlib import Path
+import re
+
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = Path(__file__).parent / "static"
+THEME_SOURCE = STATIC_DIR / "home.css"
+THEME_ASSET = STATIC_DIR / "home.min.css"
+# Where Streamlit serves STATIC_DIR when server.enableStaticServing is on.
+STATIC_URL = "app/static"
+
+INTER_FONT_URL = "https://rsms.me/inter/font-files/InterVariable.woff2"
+FONT_DIR = STATIC_DIR / "fonts"
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_WHITESPACE = re.compile(r"\s+")
+_AROUND_PUNCTUATION = re.compile(r"\s*([{};,>])\s*")
+# url() references relative to STATIC_DIR (not absolute, rooted or data: URLs).
+_RELATIVE_URL = re.compile(r"""url\((['"]?)(?!['"]|[a-z][a-z0-9+.-]*:|/)""", re.IGNORECASE)
+
+
+def minify_css(css: str) -> str:
+    """Drops comments and the whitespace CSS does not need; rules are kept as written."""
+    css = _WHITESPACE.sub(" ", _COMMENT.sub("", css))
+    css = _AROUND_PUNCTUATION.sub(r"\1", css)
+    return css.replace(": ", ":").replace(";}", "}").strip()
+
+
+def build_theme_asset(source: Path = THEME_SOURCE, target: Path = THEME_ASSET) -> Path:
+    """Writes the minified theme next to its source; run at build time, not by the app."""
+    target.write_text(minify_css(source.read_text(encoding="utf-8")), encoding="utf-8")
+    return target
+
+
+@lru_cache(maxsize=4)
+def _read_theme(source: Path, target: Path, source_mtime_ns: int, target_mtime_ns: int | None) -> tuple[str, str, bool]:
+    # Once per process and revision of both files. The app never writes the
+    # asset: a missing or stale one is reported and the source is inlined.
+    css = minify_css(source.read_text(encoding="utf-8"))
+    published = target_mtime_ns is not None and target.read_text(encoding="utf-8") == css
+    if not published:
+        logger.warning("%s is missing or out of date with %s; run `python theme_assets.py`", target, source)
+    digest = hashlib.blake2b(css.encode("utf-8"), digest_size=8).hexdigest()
+    return css, digest, published
+
+
+def theme_stylesheet_html(static_serving: bool, source: Path = THEME_SOURCE, target: Path = THEME_ASSET) -> str:
+    """
+    Markup that applies the Home theme. With static serving and a built
+    asset this is a one-line @import of the minified file, versioned by
+    content, which the browser fetches once and then revalidates; otherwise
+    the minified CSS is inlined.
+    """
+    target_mtime_ns = target.stat().st_mtime_ns if target.exists() else None
+    css, digest, published = _read_theme(source, target, source.stat().st_mtime_ns, target_mtime_ns)
+    if static_serving and published:
+        return f'<style>@import url("{STATIC_URL}/{target.name}?v={digest}");</style>'
+    # Inlined, relative url()s would resolve against the page, not static/.
+    css = _RELATIVE_URL.sub(rf"url(\g<1>{STATIC_URL}/", css)
+    return f"<style>{css}</style>"
+
+
+def fetch_inter_font(source: str = INTER_FONT_URL, directory: Path = FONT_DIR) -> Path:
+    """
+    Downloads (or copies, for a local path) the Inter variable font into
+    static/fonts/, where the theme's @font-face looks for it.
+    """
+    if source.startswith(("http://", "https://")):
+        import requests
+
+        response = requests.get(source, timeout=30)
+        response.raise_for_status()
+        content = response.content
+    else:
+        content = Path(source).read_bytes()
+
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    path = Path(directory) / "InterVariable.woff2"
+    path.write_bytes(content)
+    return path
+
+
+if __name__ == "__main__":
+    import sys
+
+    asset = build_theme_asset()
+    print(f"{asset} ({asset.stat().st_size / 1024:.1f} KB)")
+    # The font is committed; pass a URL or path (e.g. INTER_FONT_URL) to replace it.
+    if len(sys.argv) > 1:
+        font = fetch_inter_font(sys.argv[1])
+        print(f"{font} ({font.stat().st_size / 1024:.0f} KB)")
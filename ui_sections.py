@@ -6,19 +6,12 @@ from typing import Any
 import altair as alt
 import streamlit as st
 
+from chart_cache import apply_theme
+from geo_assets import level_for_viewport, load_brazil_geojson
+
 
 def _with_chart_presentation(chart: alt.Chart) -> alt.Chart:
-    return (
-        chart.properties(background="#ffffff")
-        .configure_view(stroke="#dbeafe", strokeWidth=1.2)
-        .configure_axis(
-            gridColor="#e2e8f0",
-            tickColor="#94a3b8",
-            labelColor="#334155",
-            titleColor="#0f172a",
-        )
-        .configure_legend(labelColor="#334155", titleColor="#0f172a")
-    )
+    return apply_theme(chart, "light")
 
 
 def _supports_on_select() -> bool:
@@ -66,15 +59,21 @@ def render_clickable_chart(
         use_container_width=True,
         on_select="rerun",
     )
-    if select_field is None or event is None:
+    if select_field is None:
         return None
+    return selected_value(event, select_field)
 
+
+def selected_value(event: Any, field: str) -> Any:
+    """First value of field in a chart selection event (None when nothing is selected)."""
+    if event is None:
+        return None
     payload = getattr(event, "selection", None)
     if payload is None and isinstance(event, dict):
         payload = event.get("selection")
-    value = _extract_field(payload, select_field)
-    if isinstance(value, list) and value:
-        value = value[0]
+    value = _extract_field(payload, field)
+    if isinstance(value, list):
+        value = value[0] if value else None
     return value
 
 
@@ -96,22 +95,24 @@ def render_story_stepper() -> int:
     if "story_step" not in st.session_state:
         st.session_state.story_step = 1
 
+    def step_by(offset: int) -> None:
+        st.session_state.story_step = min(len(steps), max(1, st.session_state.story_step + offset))
+
     st.markdown("### Modo apresentacao")
-    selected = st.select_slider(
+    # Keyed on story_step and moved by button callbacks, so the slider and the
+    # sections below agree on the step within a single rerun.
+    st.select_slider(
         "Etapa",
         options=list(range(1, len(steps) + 1)),
-        value=int(st.session_state.story_step),
+        key="story_step",
         format_func=lambda i: f"{i}. {steps[i - 1]}",
     )
-    st.session_state.story_step = int(selected)
 
     col1, col2, col3 = st.columns([1, 1, 5])
     with col1:
-        if st.button("Anterior", use_container_width=True):
-            st.session_state.story_step = max(1, st.session_state.story_step - 1)
+        st.button("Anterior", use_container_width=True, on_click=step_by, args=(-1,))
     with col2:
-        if st.button("Proximo", use_container_width=True):
-            st.session_state.story_step = min(len(steps), st.session_state.story_step + 1)
+        st.button("Proximo", use_container_width=True, on_click=step_by, args=(1,))
     with col3:
         st.progress(st.session_state.story_step / len(steps))
         st.caption(f"Etapa {st.session_state.story_step}/{len(steps)}: {steps[st.session_state.story_step - 1]}")
@@ -182,13 +183,26 @@ def render_delta_card(kpi: dict[str, Any], col_index: int = 0) -> None:
     )
 
 
-def render_choropleth_map(df: Any, metric_column: str, state_column: str, title: str) -> None:
+def _is_mobile_client() -> bool:
+    context = getattr(st, "context", None)
+    headers = getattr(context, "headers", None) or {}
+    return "mobile" in str(headers.get("User-Agent", "")).lower()
+
+
+def render_choropleth_map(
+    df: Any,
+    metric_column: str,
+    state_column: str,
+    title: str,
+    height: int = 500,
+) -> None:
     """
     Renders an interactive choropleth map of Brazil using plotly.
     df: DataFrame with state data
     metric_column: column name for the metric to visualize
     state_column: column name for state abbreviations
     title: map title
+    height: map height in px; also picks the geometry simplification level
     """
     try:
         import plotly.express as px
@@ -204,12 +218,17 @@ def render_choropleth_map(df: Any, metric_column: str, state_column: str, title:
             "SP": "São Paulo", "SE": "Sergipe", "TO": "Tocantins"
         }
 
-        # Create geojson URL for Brazil states
-        geojson_url = "https://raw.githubusercontent.com/codeforamerica/click_that_hood/master/public/data/brazil-states.geojson"
+        # Bundled, pre-simplified boundaries (python geo_assets.py); never fetched at render time
+        level = level_for_viewport(height, mobile=_is_mobile_client())
+        geojson = load_brazil_geojson(level)
+        if geojson is None:
+            st.warning("Mapa indisponível: fronteiras estaduais não geradas. Execute `python geo_assets.py`.")
+            _render_state_bars(df, metric_column, state_column, title)
+            return
 
         fig = px.choropleth(
             df,
-            geojson=geojson_url,
+            geojson=geojson,
             locations=state_column,
             color=metric_column,
             featureidkey="properties.sigla",
@@ -225,7 +244,7 @@ def render_choropleth_map(df: Any, metric_column: str, state_column: str, title:
 
         fig.update_layout(
             margin={"r": 0, "t": 30, "l": 0, "b": 0},
-            height=500,
+            height=height,
         )
 
         st.plotly_chart(fig, use_container_width=True)
@@ -234,15 +253,45 @@ def render_choropleth_map(df: Any, metric_column: str, state_column: str, title:
         st.warning("Plotly não está instalado. Execute: pip install plotly")
     except Exception as e:
         st.error(f"Erro ao renderizar mapa: {str(e)}")
-        # Fallback to bar chart
-        import altair as alt
-        chart = (
-            alt.Chart(df)
-            .mark_bar()
-            .encode(
-                x=alt.X(f"{metric_column}:Q", title=title),
-                y=alt.Y(f"{state_column}:N", sort="-x", title="Estado"),
-                color=alt.Color(f"{metric_column}:Q", scale=alt.Scale(scheme="teals")),
-            )
+        _render_state_bars(df, metric_column, state_column, title)
+
+
+def _render_state_bars(df: Any, metric_column: str, state_column: str, title: str) -> None:
+    # Stand-in for the choropleth when it cannot be drawn.
+    import altair as alt
+
+    chart = (
+        alt.Chart(df)
+        .mark_bar()
+        .encode(
+            x=alt.X(f"{metric_column}:Q", title=title),
+            y=alt.Y(f"{state_column}:N", sort="-x", title="Estado"),
+            color=alt.Color(f"{metric_column}:Q", scale=alt.Scale(scheme="teals")),
+        )
+    )
+    st.altair_chart(_with_chart_presentation(chart), use_container_width=True)
+
+
+def render_pipeline_diagnostics(profile: Any) -> None:
+    """
+    Sidebar panel with the PipelineProfile of the bundle being served:
+    per-stage timings/rows/memory, per-URL fetch results and a JSON download.
+    """
+    import pandas as pd
+
+    with st.sidebar.expander("🔧 Diagnóstico do pipeline"):
+        if profile is None:
+            st.caption("Bundle sem perfil registrado.")
+            return
+        st.caption(f"Build em {profile.started_utc[:19]} UTC • total {profile.total_s:.2f}s")
+        stages = pd.DataFrame([vars(stage) for stage in profile.stages])
+        st.dataframe(stages, hide_index=True, use_container_width=True)
+        if profile.fetches:
+            fetches = pd.DataFrame([vars(fetch) for fetch in profile.fetches]).drop(columns="url")
+            st.dataframe(fetches, hide_index=True, use_container_width=True)
+        st.download_button(
+            "Baixar JSON",
+            profile.to_json(),
+            file_name="pipeline_profile.json",
+            mime="application/json",
         )
-        st.altair_chart(_with_chart_presentation(chart), use_container_width=True)